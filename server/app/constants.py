@@ -5,6 +5,7 @@ Centralized configuration values for the Eigensparse Consent Management System.
 This module contains all magic numbers, limits, and configuration constants
 to ensure consistency across the application and easy modification.
 """
+from typing import Final
 
 # =============================================================================
 # PAGINATION DEFAULTS
@@ -76,6 +77,65 @@ WEBHOOK_MAX_RETRIES = 3
 WEBHOOK_RETRY_DELAYS = [60, 300, 900]
 """Retry delay in seconds for each attempt (1min, 5min, 15min)."""
 
+WEBHOOK_RETRY_INTERVAL_SECONDS = 30
+"""How often the background worker looks for queued or due deliveries when not woken."""
+
+WEBHOOK_RETRY_BATCH_SIZE = 100
+"""Maximum deliveries claimed per retry batch."""
+
+WEBHOOK_RETRY_CONCURRENCY = 10
+"""Parallel HTTP requests per retry batch."""
+
+WEBHOOK_RETRY_LEASE_SECONDS = 300
+"""How long a claimed delivery is reserved before another worker may retry it."""
+
+WEBHOOK_MAX_CONNECTIONS = 100
+"""Connection cap of the shared client used for immediate deliveries."""
+
+WEBHOOK_MAX_KEEPALIVE_CONNECTIONS = 20
+"""Idle connections the shared delivery client keeps open for reuse."""
+
+
+# =============================================================================
+# EMAIL DELIVERY
+# =============================================================================
+
+EMAIL_SEND_ATTEMPTS = 3
+"""Attempts per email before giving up (first try included)."""
+
+EMAIL_RETRY_BACKOFF_SECONDS = 2.0
+"""Base delay between email attempts; doubles after each failure."""
+
+
+# =============================================================================
+# CONSENT EXPIRY
+# =============================================================================
+
+CONSENT_EXPIRY_SWEEP_SECONDS = 60 * 60
+"""How often lapsed GRANTED consents are marked EXPIRED in bulk."""
+
+
+# =============================================================================
+# AUDIT LOG PARTITIONING
+# =============================================================================
+
+AUDIT_PARTITION_MONTHS_AHEAD = 2
+"""Monthly audit_logs partitions kept created beyond the current month."""
+
+AUDIT_PARTITION_CHECK_SECONDS = 24 * 60 * 60
+"""How often the background worker makes sure upcoming partitions exist."""
+
+
+# =============================================================================
+# RECEIPT PDF CACHE
+# =============================================================================
+
+PDF_CACHE_MAX_ENTRIES = 1000
+"""Rendered receipt PDFs kept in memory per process."""
+
+PDF_CACHE_TTL_SECONDS = 24 * 60 * 60
+"""How long a rendered receipt PDF is reused."""
+
 
 # =============================================================================
 # PDF STYLING CONSTANTS
@@ -84,6 +144,8 @@ WEBHOOK_RETRY_DELAYS = [60, 300, 900]
 class PDFStyle:
     """PDF generation styling constants."""
 
+    __slots__ = ()
+
     # Page layout
     TOP_MARGIN_INCHES = 0.5
 
@@ -146,49 +208,90 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 # ERROR MESSAGES
 # =============================================================================
 
+# Authentication errors
+INVALID_CREDENTIALS: Final = "Invalid email or password"
+REGISTRATION_FAILED: Final = "Registration failed. Please try again or contact support."
+UNAUTHORIZED: Final = "Authentication required"
+FORBIDDEN: Final = "You don't have permission to access this resource"
+SESSION_EXPIRED: Final = "Session expired. Please login again."
+
+# Resource errors
+NOT_FOUND: Final = "{resource} not found"
+ALREADY_EXISTS: Final = "{resource} already exists"
+
+# Consent errors
+CONSENT_NOT_FOUND: Final = "Consent not found"
+CONSENT_ALREADY_GRANTED: Final = "Consent already granted for this purpose"
+CONSENT_ALREADY_REVOKED: Final = "Consent already revoked"
+
+# Fiduciary errors
+FIDUCIARY_NOT_FOUND: Final = "Fiduciary not found"
+PURPOSE_NOT_FOUND: Final = "Purpose not found"
+
+# Webhook errors
+WEBHOOK_NOT_FOUND: Final = "Webhook not found"
+WEBHOOK_LIMIT_REACHED: Final = f"Maximum webhook limit reached ({MAX_WEBHOOKS_PER_FIDUCIARY})"
+WEBHOOK_URL_INVALID: Final = "Webhook URL cannot point to private or internal networks"
+
+# Validation errors
+INVALID_INPUT: Final = "Invalid input provided"
+FIELD_REQUIRED: Final = "{field} is required"
+FIELD_TOO_SHORT: Final = "{field} must be at least {min} characters"
+FIELD_TOO_LONG: Final = "{field} must not exceed {max} characters"
+
+# Database errors
+DATABASE_ERROR: Final = "Database error occurred. Please try again."
+
+# Bound template formatters
+_format_not_found = NOT_FOUND.format
+_format_already_exists = ALREADY_EXISTS.format
+
+
 class ErrorMessages:
     """Standardized error messages for consistent API responses."""
 
+    __slots__ = ()
+
     # Authentication errors
-    INVALID_CREDENTIALS = "Invalid email or password"
-    REGISTRATION_FAILED = "Registration failed. Please try again or contact support."
-    UNAUTHORIZED = "Authentication required"
-    FORBIDDEN = "You don't have permission to access this resource"
-    SESSION_EXPIRED = "Session expired. Please login again."
+    INVALID_CREDENTIALS = INVALID_CREDENTIALS
+    REGISTRATION_FAILED = REGISTRATION_FAILED
+    UNAUTHORIZED = UNAUTHORIZED
+    FORBIDDEN = FORBIDDEN
+    SESSION_EXPIRED = SESSION_EXPIRED
 
     # Resource errors
-    NOT_FOUND = "{resource} not found"
-    ALREADY_EXISTS = "{resource} already exists"
+    NOT_FOUND = NOT_FOUND
+    ALREADY_EXISTS = ALREADY_EXISTS
 
     # Consent errors
-    CONSENT_NOT_FOUND = "Consent not found"
-    CONSENT_ALREADY_GRANTED = "Consent already granted for this purpose"
-    CONSENT_ALREADY_REVOKED = "Consent already revoked"
+    CONSENT_NOT_FOUND = CONSENT_NOT_FOUND
+    CONSENT_ALREADY_GRANTED = CONSENT_ALREADY_GRANTED
+    CONSENT_ALREADY_REVOKED = CONSENT_ALREADY_REVOKED
 
     # Fiduciary errors
-    FIDUCIARY_NOT_FOUND = "Fiduciary not found"
-    PURPOSE_NOT_FOUND = "Purpose not found"
+    FIDUCIARY_NOT_FOUND = FIDUCIARY_NOT_FOUND
+    PURPOSE_NOT_FOUND = PURPOSE_NOT_FOUND
 
     # Webhook errors
-    WEBHOOK_NOT_FOUND = "Webhook not found"
-    WEBHOOK_LIMIT_REACHED = f"Maximum webhook limit reached ({MAX_WEBHOOKS_PER_FIDUCIARY})"
-    WEBHOOK_URL_INVALID = "Webhook URL cannot point to private or internal networks"
+    WEBHOOK_NOT_FOUND = WEBHOOK_NOT_FOUND
+    WEBHOOK_LIMIT_REACHED = WEBHOOK_LIMIT_REACHED
+    WEBHOOK_URL_INVALID = WEBHOOK_URL_INVALID
 
     # Validation errors
-    INVALID_INPUT = "Invalid input provided"
-    FIELD_REQUIRED = "{field} is required"
-    FIELD_TOO_SHORT = "{field} must be at least {min} characters"
-    FIELD_TOO_LONG = "{field} must not exceed {max} characters"
+    INVALID_INPUT = INVALID_INPUT
+    FIELD_REQUIRED = FIELD_REQUIRED
+    FIELD_TOO_SHORT = FIELD_TOO_SHORT
+    FIELD_TOO_LONG = FIELD_TOO_LONG
 
     # Database errors
-    DATABASE_ERROR = "Database error occurred. Please try again."
+    DATABASE_ERROR = DATABASE_ERROR
 
-    @classmethod
-    def not_found(cls, resource: str) -> str:
+    @staticmethod
+    def not_found(resource: str) -> str:
         """Generate a not found message for a resource."""
-        return cls.NOT_FOUND.format(resource=resource)
+        return _format_not_found(resource=resource)
 
-    @classmethod
-    def already_exists(cls, resource: str) -> str:
+    @staticmethod
+    def already_exists(resource: str) -> str:
         """Generate an already exists message for a resource."""
-        return cls.ALREADY_EXISTS.format(resource=resource)
+        return _format_already_exists(resource=resource)
@@ -2,8 +2,13 @@
 Database Configuration
 PostgreSQL connection with SQLAlchemy
 """
+import os
+import time
+import uuid
+import orjson
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import Uuid, create_engine, inspect
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
@@ -13,42 +18,105 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Per-connection server settings: a runaway query or a transaction left
+# open cannot hold a pooled connection indefinitely
+_CONNECT_OPTIONS = (
+    f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS} "
+    f"-c idle_in_transaction_session_timeout={settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS}"
+)
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    connect_args={"options": _CONNECT_OPTIONS},
+    # psycopg2 fast execution helpers: multi-VALUES INSERTs plus
+    # execute_batch() for executemany UPDATE/DELETE
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    # Compiled SQL cache shared by all sessions (default 500 entries)
+    query_cache_size=1200,
+    # JSONB columns are (de)serialized with orjson; default=str keeps
+    # values such as Decimal or UUID storable as before
+    json_serializer=lambda obj: orjson.dumps(obj, default=str).decode(),
+    json_deserializer=orjson.loads,
 )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session factory. Objects keep their loaded state across commit: server
+# defaults come back via INSERT/UPDATE ... RETURNING, so handlers can
+# serialize what they just wrote without a follow-up SELECT (db.refresh).
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 # Base class for models
 Base = declarative_base()
 
 
+def generate_uuid() -> str:
+    """
+    Default for public UUID columns (canonical 36-char dashed form).
+    Generates a time-ordered UUIDv7 (RFC 9562): 48-bit Unix milliseconds
+    followed by 74 random bits, so new rows append to the tail of the
+    uuid indexes instead of splitting random pages.
+    """
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (time.time_ns() // 1_000_000) << 80
+        | 0x7 << 76                          # version
+        | (rand >> 62 & 0xFFF) << 64         # rand_a
+        | 0b10 << 62                         # variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF       # rand_b
+    )
+    return str(uuid.UUID(int=value))
+
+
+class UUIDString(TypeDecorator):
+    """
+    Native 16-byte UUID column that reads and writes canonical strings.
+    Values that are not valid UUIDs (e.g. malformed path parameters) bind
+    as NULL, so lookups simply match nothing instead of raising a
+    database error.
+    """
+    impl = Uuid(as_uuid=False)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            return None
+
+
 def get_db():
     """
     Database session dependency.
     Yields a database session and ensures it's closed after use.
+    The session only checks out a pooled connection on its first query,
+    so endpoints that never touch the database cost no DB work.
     """
-    db = SessionLocal()
-    try:
+    with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def init_db():
     """
     Initialize database tables.
     Called on application startup.
+    Lists existing tables in one query and only runs create_all for
+    tables that are missing, so restarts against a migrated schema skip
+    the per-table existence checks.
     """
-    # Import all models to ensure they're registered
-    from app.models import User, DataFiduciary, Purpose, Consent, ConsentReceipt, AuditLog
-
-    Base.metadata.create_all(bind=engine)
+    existing = set(inspect(engine).get_table_names())
+    missing = [t for t in Base.metadata.sorted_tables if t.name not in existing]
+    if missing:
+        Base.metadata.create_all(bind=engine, tables=missing)
 
 
 def safe_commit(db: Session, operation: str = "database operation") -> bool:
@@ -97,3 +165,8 @@ def atomic_transaction(db: Session):
     except Exception as e:
         db.rollback()
         raise
+
+
+# Register all ORM classes on Base.metadata. Imported last because the
+# model modules themselves import Base from here.
+from app import models  # noqa: E402,F401
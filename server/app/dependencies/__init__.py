@@ -1,4 +1,6 @@
 """
 FastAPI Dependencies
 """
-from app.dependencies.auth import get_current_user, get_current_fiduciary, get_fiduciary_by_api_key
+from app.dependencies.auth import get_principal, get_current_user, get_current_fiduciary, get_fiduciary_by_api_key
+from app.dependencies.auth import invalidate_user, invalidate_fiduciary
+from app.dependencies.clock import now_utc
@@ -2,110 +2,151 @@
 Authentication Dependencies
 FastAPI dependencies for authentication
 """
-from typing import Optional
-from fastapi import Depends, HTTPException, status, Header
+import threading
+from types import MappingProxyType
+from typing import Optional, Union
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status, Header
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
-from app.services.auth import decode_token
+from app.services.auth import decode_token, hash_api_key
 from app.models import User, DataFiduciary
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
+# Short-lived caches of authenticated principals. Entries are detached
+# snapshots; each request re-attaches them to its own session via merge.
+_PRINCIPAL_CACHE_SIZE = settings.AUTH_CACHE_MAX_ENTRIES
+_PRINCIPAL_CACHE_TTL = settings.AUTH_CACHE_TTL_SECONDS
 
-def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Get current authenticated user from JWT token.
-    Raises 401 if not authenticated.
-    """
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+_cache_lock = threading.Lock()
+_user_cache: TTLCache = TTLCache(maxsize=_PRINCIPAL_CACHE_SIZE, ttl=_PRINCIPAL_CACHE_TTL)
+_fiduciary_cache: TTLCache = TTLCache(maxsize=_PRINCIPAL_CACHE_SIZE, ttl=_PRINCIPAL_CACHE_TTL)
+_api_key_cache: TTLCache = TTLCache(maxsize=_PRINCIPAL_CACHE_SIZE, ttl=_PRINCIPAL_CACHE_TTL)
 
-    token = authorization.split(" ")[1]
-    payload = decode_token(token)
 
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+def _cache_get(cache: TTLCache, key):
+    with _cache_lock:
+        return cache.get(key)
 
-    user_id = payload.get("sub")
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+def _cache_put(cache: TTLCache, key, obj, db: Session):
+    """Detach obj from its session, cache it and return a session-bound copy"""
+    db.expunge(obj)
+    with _cache_lock:
+        cache[key] = obj
+    return db.merge(obj, load=False)
 
-    return user
 
+def invalidate_user(user_id: int) -> None:
+    """Drop a cached user. Call after changing or deleting the account."""
+    with _cache_lock:
+        _user_cache.pop(user_id, None)
 
-def get_current_fiduciary(
+
+def invalidate_fiduciary(fiduciary_id: int) -> None:
+    """Drop a cached fiduciary, including any API key lookups for it"""
+    with _cache_lock:
+        _fiduciary_cache.pop(fiduciary_id, None)
+        stale = [k for k, f in _api_key_cache.items() if f.id == fiduciary_id]
+        for key in stale:
+            _api_key_cache.pop(key, None)
+
+
+# 401 response parts shared by every auth failure. Exceptions themselves are
+# built per raise: re-raising one shared instance would keep chaining
+# tracebacks (and their frames) onto it.
+_BEARER_CHALLENGE = MappingProxyType({"WWW-Authenticate": "Bearer"})
+_NOT_AUTHENTICATED = "Not authenticated"
+_INVALID_TOKEN = "Invalid token"
+_INVALID_API_KEY = "Invalid API key"
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_BEARER_CHALLENGE,
+    )
+
+
+def get_principal(
+    request: Request,
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_db)
-) -> DataFiduciary:
+) -> Union[User, DataFiduciary]:
     """
-    Get current authenticated fiduciary from JWT token.
-    Validates that the token has fiduciary role.
+    Resolve the authenticated principal from the JWT token.
+    Tokens with the fiduciary role resolve to a DataFiduciary, all others
+    to a User. The result is memoized on request.state.principal so the
+    header is parsed and the token verified once per request.
     """
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
 
-    token = authorization.split(" ")[1]
-    payload = decode_token(token)
+    if not authorization or authorization[:7] != "Bearer ":
+        raise _unauthorized(_NOT_AUTHENTICATED)
 
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    token = authorization[7:]
+    payload = decode_token(token)
 
-    fiduciary_id = payload.get("sub")
-    role = payload.get("role")
+    if payload is None or payload.get("sub") is None:
+        raise _unauthorized(_INVALID_TOKEN)
+
+    principal_id = int(payload["sub"])
+
+    if payload.get("role") == "fiduciary":
+        cached = _cache_get(_fiduciary_cache, principal_id)
+        if cached is not None:
+            principal = db.merge(cached, load=False)
+        else:
+            fiduciary = db.query(DataFiduciary).filter(
+                DataFiduciary.id == principal_id
+            ).first()
+            if fiduciary is None:
+                raise _unauthorized("Fiduciary not found")
+            principal = _cache_put(_fiduciary_cache, principal_id, fiduciary, db)
+    else:
+        cached = _cache_get(_user_cache, principal_id)
+        if cached is not None:
+            principal = db.merge(cached, load=False)
+        else:
+            user = db.query(User).filter(User.id == principal_id).first()
+            if user is None:
+                raise _unauthorized("User not found")
+            principal = _cache_put(_user_cache, principal_id, user, db)
+
+    request.state.principal = principal
+    return principal
 
-    if fiduciary_id is None or role != "fiduciary":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
 
-    fiduciary = db.query(DataFiduciary).filter(
-        DataFiduciary.id == int(fiduciary_id)
-    ).first()
+def get_current_user(
+    principal: Union[User, DataFiduciary] = Depends(get_principal)
+) -> User:
+    """
+    Get current authenticated user from JWT token.
+    Raises 401 if not authenticated.
+    """
+    if not isinstance(principal, User):
+        raise _unauthorized(_INVALID_TOKEN)
+    return principal
 
-    if fiduciary is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Fiduciary not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
 
-    return fiduciary
+def get_current_fiduciary(
+    principal: Union[User, DataFiduciary] = Depends(get_principal)
+) -> DataFiduciary:
+    """
+    Get current authenticated fiduciary from JWT token.
+    Validates that the token has fiduciary role.
+    """
+    if not isinstance(principal, DataFiduciary):
+        raise _unauthorized(_INVALID_TOKEN)
+    return principal
 
 
 def get_fiduciary_by_api_key(
@@ -116,15 +157,21 @@ def get_fiduciary_by_api_key(
     Get fiduciary by API key.
     Used for SDK integration endpoints.
     """
+    # Keys are stored (and cached) by hash only, never in plaintext
+    key_hash = hash_api_key(x_api_key)
+    cached = _cache_get(_api_key_cache, key_hash)
+    if cached is not None:
+        return db.merge(cached, load=False)
+
     fiduciary = db.query(DataFiduciary).filter(
-        DataFiduciary.api_key == x_api_key,
+        DataFiduciary.api_key_hash == key_hash,
         DataFiduciary.is_active == True
     ).first()
 
     if not fiduciary:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key"
+            detail=_INVALID_API_KEY
         )
 
-    return fiduciary
+    return _cache_put(_api_key_cache, key_hash, fiduciary, db)
@@ -0,0 +1,14 @@
+"""
+Clock Dependencies
+Request-scoped current time
+"""
+from datetime import datetime, timezone
+
+
+def now_utc() -> datetime:
+    """
+    Current UTC time, read once per request.
+    Handlers use this single value for token expiries and expiry checks,
+    so everything a request writes shares one timestamp.
+    """
+    return datetime.now(timezone.utc)
@@ -4,22 +4,33 @@ DPDP Act & GDPR Compliant Consent Management Platform
 
 Main application entry point.
 """
+import asyncio
+import hmac
 import time
 import logging
 
-from fastapi import FastAPI, Request
+import anyio.to_thread
+
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 
 from app.config import settings
-from app.database import init_db, get_db
+from app.database import engine, init_db
+from app.rate_limit import limiter
 from app.routers import auth, fiduciary, purposes, consents, audit, sdk, dashboard, webhooks
 from app.routers import settings as settings_router
+from app.services.audit import run_audit_partition_worker
+from app.services.auth import check_password_hash_cost
+from app.services.email import email_service
+from app.services.expiry import run_consent_expiry_worker
+from app.services.pdf import start_pdf_pool, shutdown_pdf_pool
+from app.services.webhook import run_webhook_retry_worker, close_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -29,7 +40,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Add security headers to all responses.
 
@@ -40,34 +51,45 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Referrer-Policy: Control referrer information
     - Permissions-Policy: Disable unnecessary browser features
     - Strict-Transport-Security: Force HTTPS (production only)
-    """
-
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
 
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # XSS Protection (legacy browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Referrer Policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Permissions Policy (disable unnecessary features)
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+    Implemented as plain ASGI middleware: headers are pre-encoded once and
+    appended to the response start message.
+    """
 
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.headers = [
+            # Prevent clickjacking
+            (b"x-frame-options", b"DENY"),
+            # Prevent MIME type sniffing
+            (b"x-content-type-options", b"nosniff"),
+            # XSS Protection (legacy browsers)
+            (b"x-xss-protection", b"1; mode=block"),
+            # Referrer Policy
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+            # Permissions Policy (disable unnecessary features)
+            (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+        ]
         # HSTS - Force HTTPS (only in production)
         if not settings.DEBUG:
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+            self.headers.append(
+                (b"strict-transport-security", b"max-age=31536000; includeSubDomains")
+            )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        return response
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *self.headers]
+            await send(message)
 
+        await self.app(scope, receive, send_with_headers)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+
+class RequestLoggingMiddleware:
     """
     Log all incoming requests with timing information.
 
@@ -75,30 +97,78 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     Health check endpoints are skipped to reduce log noise.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
+        start_ns = time.perf_counter_ns()
+        status_code = 500
+        elapsed_ns = 0
 
-        process_time = time.time() - start_time
+        async def send_with_timing(message: Message):
+            nonlocal status_code, elapsed_ns
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                # Add processing time header (seconds)
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-process-time", f"{elapsed_ns / 1_000_000_000:.3f}".encode()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
 
         # Log request details (skip health checks to reduce noise)
-        if not request.url.path.startswith("/health"):
+        path = scope["path"]
+        if logger.isEnabledFor(logging.INFO) and not path.startswith("/health"):
+            client = scope.get("client")
             logger.info(
-                f"{request.method} {request.url.path} - "
-                f"Status: {response.status_code} - "
-                f"Time: {process_time:.3f}s - "
-                f"Client: {request.client.host if request.client else 'unknown'}"
+                "%s %s - Status: %d - Time: %.3fs - Client: %s",
+                scope["method"], path, status_code, elapsed_ns / 1_000_000_000,
+                client[0] if client else "unknown",
             )
 
-        # Add processing time header
-        response.headers["X-Process-Time"] = f"{process_time:.3f}"
 
-        return response
+class ClientIPMiddleware:
+    """
+    Resolve the client IP once per request into request.state.client_ip.
+
+    With TRUST_PROXY_HEADERS enabled the X-Forwarded-For address
+    TRUSTED_PROXY_COUNT hops from the right is used: the peer the outermost
+    trusted proxy saw. Addresses further left are client-supplied and never
+    used. Otherwise (or if the header has fewer hops) the socket peer
+    address. Handlers read the stored value instead of repeating the
+    lookup for every audit entry.
+    """
 
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.trust_proxy = settings.TRUST_PROXY_HEADERS
+        self.proxy_count = max(settings.TRUSTED_PROXY_COUNT, 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            client_ip = None
+            if self.trust_proxy:
+                # Repeated headers are one list, in order
+                hops = [
+                    hop.strip()
+                    for name, value in scope["headers"] if name == b"x-forwarded-for"
+                    for hop in value.decode("latin-1").split(",")
+                ]
+                if len(hops) >= self.proxy_count:
+                    client_ip = hops[-self.proxy_count] or None
+            if client_ip is None:
+                client = scope.get("client")
+                client_ip = client[0] if client else None
+            scope.setdefault("state", {})["client_ip"] = client_ip
+        await self.app(scope, receive, send)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
 
 # Create FastAPI application
 app = FastAPI(
@@ -109,24 +179,39 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# Add rate limiter to app state
+# Shared rate limiter (app/rate_limit.py), also used by every router
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_exhausted_handler(request, exc):
+    """Every pooled connection stayed busy for DB_POOL_TIMEOUT_SECONDS"""
+    logger.warning("Database pool exhausted: %s", engine.pool.status())
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service busy. Please retry shortly."},
+        headers={"Retry-After": "1"}
+    )
+
 # Add security headers middleware
 app.add_middleware(SecurityHeadersMiddleware)
 
 # Add request logging middleware
 app.add_middleware(RequestLoggingMiddleware)
 
+# Resolve the client IP first so everything below can read it
+app.add_middleware(ClientIPMiddleware)
+
 # CORS middleware - Allow production and local origins
-cors_origins = [
+CORS_ORIGINS: tuple[str, ...] = (
     "https://eigensparse.com",
     "https://www.eigensparse.com",
-] + settings.cors_origins_list
+    *settings.cors_origins_list,
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=cors_origins,
+    allow_origins=list(CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization", "X-API-Key", "Accept"],
@@ -146,8 +231,27 @@ app.include_router(settings_router.router)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
+    """Initialize database and start background workers on startup"""
+    # Size the pool sync endpoints run on (AnyIO defaults to 40 threads)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
     init_db()
+    check_password_hash_cost()
+    start_pdf_pool()
+    app.state.webhook_retry_task = asyncio.create_task(run_webhook_retry_worker())
+    app.state.audit_partition_task = asyncio.create_task(run_audit_partition_worker())
+    app.state.consent_expiry_task = asyncio.create_task(run_consent_expiry_worker())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers"""
+    for name in ("webhook_retry_task", "audit_partition_task", "consent_expiry_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    await email_service.aclose()
+    shutdown_pdf_pool()
+    close_http_client()
 
 
 # ========== Health Check Endpoints ==========
@@ -168,31 +272,63 @@ async def liveness_check():
     return {"status": "alive"}
 
 
+# Seconds a successful database ping is reused by the readiness probe
+READINESS_CACHE_SECONDS = 5.0
+_last_db_ok = 0.0
+
+
 @app.get("/health/ready", tags=["Health"])
-async def readiness_check():
+def readiness_check():
     """Readiness probe - checks if the application can serve requests"""
-    try:
-        # Check database connection
-        db = next(get_db())
-        db.execute(text("SELECT 1"))
-        db_status = "connected"
-    except Exception as e:
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "unhealthy",
-                "database": "disconnected",
-                "error": str(e)
-            }
-        )
+    global _last_db_ok
+
+    if time.monotonic() - _last_db_ok > READINESS_CACHE_SECONDS:
+        try:
+            # Check database connection (engine-level, no ORM session)
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except SQLAlchemyError as e:
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "status": "unhealthy",
+                    "database": "disconnected",
+                    "error": str(e)
+                }
+            )
+        _last_db_ok = time.monotonic()
 
     return {
         "status": "ready",
-        "database": db_status,
+        "database": "connected",
         "service": settings.APP_NAME
     }
 
 
+def require_metrics_token(request: Request) -> None:
+    """
+    Internal-only guard for /metrics: a 404 unless METRICS_TOKEN is set
+    and sent as "Authorization: Bearer <token>".
+    """
+    expected = settings.METRICS_TOKEN
+    supplied = request.headers.get("authorization", "")
+    if not expected or not hmac.compare_digest(supplied.encode(), f"Bearer {expected}".encode()):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+def pool_metrics():
+    """Database connection pool usage for this process"""
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
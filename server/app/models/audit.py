@@ -1,13 +1,15 @@
 """
 Audit Log Model & Enums - DPDP Section 8 & GDPR Article 30
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import (
+    DDL, Column, Integer, String, DateTime, ForeignKey, Index, Enum as SQLEnum, event
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-import uuid
+from sqlalchemy.sql import func, text
 import enum
 
-from app.database import Base
+from app.database import Base, UUIDString, generate_uuid
 
 
 class ConsentStatus(enum.Enum):
@@ -36,20 +38,55 @@ class AuditLog(Base):
     """
     Audit Log - DPDP Section 8 & GDPR Article 30 (Records of Processing)
     Immutable log of all consent-related actions.
+
+    On PostgreSQL the table is range-partitioned by created_at, one child
+    table per month (audit_logs_YYYY_MM) plus a default partition. Time
+    filtered queries only scan the matching months, and old months can be
+    dropped as whole tables. Partitions are created ahead of time by
+    app.services.audit.ensure_audit_partitions.
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Per-principal listings ordered newest first (keyset on created_at, id)
+        Index("ix_audit_user_created", "user_id", text("created_at DESC"), text("id DESC")),
+        Index("ix_audit_fiduciary_created", "fiduciary_id", text("created_at DESC"), text("id DESC")),
+        Index("ix_audit_user_action_created", "user_id", "action", text("created_at DESC")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    uuid = Column(String(36), unique=True, index=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
-    fiduciary_id = Column(Integer, ForeignKey("data_fiduciaries.id"), nullable=True, index=True)
-    action = Column(SQLEnum(AuditAction), nullable=False, index=True)
+    # The partition key has to be part of the primary key (and of any unique
+    # constraint), so the key is (id, created_at). Entries are never looked
+    # up by uuid, so it carries no index.
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    uuid = Column(UUIDString, default=generate_uuid)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    fiduciary_id = Column(Integer, ForeignKey("data_fiduciaries.id"), nullable=True)
+    # Stored as VARCHAR + CHECK rather than a native PG enum type
+    action = Column(
+        SQLEnum(AuditAction, native_enum=False, create_constraint=True,
+                length=32, name="ck_audit_action"),
+        nullable=False, index=True
+    )
     resource_type = Column(String(50), nullable=False)
     resource_id = Column(String(36), nullable=True)
-    details = Column(Text, nullable=True)  # JSON with action details
+    details = Column(JSONB, nullable=True)  # Action details
     ip_address = Column(String(45), nullable=True)
     user_agent = Column(String(500), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
 
     # Relationships
     user = relationship("User", back_populates="audit_logs")
+
+
+# A partitioned table without partitions rejects every insert; give freshly
+# created tables a catch-all partition until the monthly ones exist.
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS audit_logs_default "
+        "PARTITION OF audit_logs DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
@@ -1,12 +1,12 @@
 """
 Consent Models - Core of DPDP & GDPR Compliance
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-import uuid
+from sqlalchemy.sql import func, text
 
-from app.database import Base
+from app.database import Base, UUIDString, generate_uuid
 from app.models.audit import ConsentStatus
 
 
@@ -16,13 +16,35 @@ class Consent(Base):
     Tracks user consent for specific purposes.
     """
     __tablename__ = "consents"
+    # Fetch granted_at and SQL-expression timestamps (expires_at,
+    # revoked_at set to now()) via RETURNING on flush instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Live consents only (status stores enum names). Expired rows are
+        # moved out by the periodic expiry sweep, keeping these small.
+        Index("ix_consents_active", "user_id", "expires_at",
+              postgresql_where=text("status = 'GRANTED'")),
+        Index("ix_consents_fiduciary_active", "fiduciary_id", "expires_at",
+              postgresql_where=text("status = 'GRANTED'")),
+        # At most one live consent per user and purpose; grant relies on it
+        # (ON CONFLICT DO NOTHING) instead of checking first
+        Index("ux_consents_user_purpose_active", "user_id", "purpose_id",
+              unique=True, postgresql_where=text("status = 'GRANTED'")),
+        # A user's consents, newest first, with or without a status filter
+        Index("ix_consents_user_granted_at", "user_id", text("granted_at DESC")),
+        Index("ix_consents_user_status", "user_id", "status"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    uuid = Column(String(36), unique=True, index=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUIDString, unique=True, index=True, default=generate_uuid)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     fiduciary_id = Column(Integer, ForeignKey("data_fiduciaries.id"), nullable=False, index=True)
     purpose_id = Column(Integer, ForeignKey("purposes.id"), nullable=False, index=True)
-    status = Column(SQLEnum(ConsentStatus), default=ConsentStatus.GRANTED, index=True)
+    status = Column(
+        SQLEnum(ConsentStatus, native_enum=False, create_constraint=True,
+                length=32, name="ck_consent_status"),
+        default=ConsentStatus.GRANTED, index=True
+    )
     granted_at = Column(DateTime(timezone=True), server_default=func.now())
     revoked_at = Column(DateTime(timezone=True), nullable=True)
     expires_at = Column(DateTime(timezone=True), nullable=True)
@@ -43,11 +65,15 @@ class ConsentReceipt(Base):
     Provides proof of consent with signature.
     """
     __tablename__ = "consent_receipts"
+    __table_args__ = (
+        # Newest receipt of a consent (renewals add one each)
+        Index("ix_consent_receipts_consent_issued", "consent_id", text("issued_at DESC")),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    receipt_id = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    receipt_id = Column(UUIDString, unique=True, default=generate_uuid)
     consent_id = Column(Integer, ForeignKey("consents.id"), nullable=False)
-    receipt_data = Column(Text, nullable=False)  # JSON with full consent details
+    receipt_data = Column(JSONB, nullable=False)  # Full consent details
     signature = Column(String(500), nullable=True)  # Digital signature
     issued_at = Column(DateTime(timezone=True), server_default=func.now())
 
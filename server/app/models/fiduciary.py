@@ -1,12 +1,11 @@
 """
 Data Fiduciary Model - Organization/Data Controller (DPDP/GDPR)
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
-from app.database import Base
+from app.database import Base, UUIDString, generate_uuid
 
 
 class DataFiduciary(Base):
@@ -15,27 +14,41 @@ class DataFiduciary(Base):
     """
     __tablename__ = "data_fiduciaries"
 
-    id = Column(Integer, primary_key=True, index=True)
-    uuid = Column(String(36), unique=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUIDString, unique=True, index=True, default=generate_uuid)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     privacy_policy_url = Column(String(500), nullable=True)
     contact_email = Column(String(255), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=True)
-    api_key = Column(String(64), unique=True, nullable=False)
+    hashed_password = Column(String(255), nullable=False)
+    # Only a SHA-256 of the API key is stored; prefix/suffix are for display
+    api_key_hash = Column(String(64), unique=True, nullable=False)
+    api_key_prefix = Column(String(8), nullable=False)
+    api_key_suffix = Column(String(4), nullable=False)
+    api_key_hint = Column(String(16), nullable=False)  # "<prefix>****<suffix>"
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Email verification
     email_verified = Column(Boolean, default=False)
-    verification_token = Column(String(100), nullable=True)
+    # Emailed tokens are stored as SHA-256 hex digests only
+    verification_token_hash = Column(String(64), nullable=True, index=True)
     verification_token_expires = Column(DateTime(timezone=True), nullable=True)
 
     # Password reset
-    reset_token = Column(String(100), nullable=True)
+    reset_token_hash = Column(String(64), nullable=True, index=True)
     reset_token_expires = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     purposes = relationship("Purpose", back_populates="fiduciary")
     consents = relationship("Consent", back_populates="fiduciary")
     webhooks = relationship("Webhook", back_populates="fiduciary", cascade="all, delete-orphan")
+
+
+# Email lookups compare lower(contact_email) so any casing still hits an index;
+# unique so one address (in any casing) belongs to one account
+Index(
+    "ix_data_fiduciaries_contact_email_lower",
+    func.lower(DataFiduciary.contact_email),
+    unique=True
+)
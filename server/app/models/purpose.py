@@ -2,11 +2,11 @@
 Purpose Model - DPDP Section 6 & GDPR Article 5 (Purpose Limitation)
 """
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
-from app.database import Base
+from app.database import Base, UUIDString, generate_uuid
 
 
 class Purpose(Base):
@@ -16,12 +16,12 @@ class Purpose(Base):
     """
     __tablename__ = "purposes"
 
-    id = Column(Integer, primary_key=True, index=True)
-    uuid = Column(String(36), unique=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUIDString, unique=True, index=True, default=generate_uuid)
     fiduciary_id = Column(Integer, ForeignKey("data_fiduciaries.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
-    data_categories = Column(Text, nullable=False)  # JSON array of data types
+    data_categories = Column(JSONB, nullable=False)  # Array of data types
     retention_period_days = Column(Integer, nullable=False)  # DPDP Section 8(7)
     legal_basis = Column(String(100), nullable=False)  # GDPR Article 6 basis
     is_mandatory = Column(Boolean, default=False)
@@ -1,12 +1,11 @@
 """
 User Model - Data Principal (DPDP/GDPR)
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
-from app.database import Base
+from app.database import Base, UUIDString, generate_uuid
 
 
 class User(Base):
@@ -14,9 +13,11 @@ class User(Base):
     Data Principal (User/Data Subject under DPDP/GDPR)
     """
     __tablename__ = "users"
+    # Fetch created_at/updated_at via RETURNING instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(Integer, primary_key=True, index=True)
-    uuid = Column(String(36), unique=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUIDString, unique=True, index=True, default=generate_uuid)
     email = Column(String(255), unique=True, index=True, nullable=False)
     name = Column(String(255), nullable=False)
     phone = Column(String(20), nullable=True)
@@ -27,13 +28,19 @@ class User(Base):
 
     # Email verification
     email_verified = Column(Boolean, default=False)
-    verification_token = Column(String(100), nullable=True)
+    # Emailed tokens are stored as SHA-256 hex digests only
+    verification_token_hash = Column(String(64), nullable=True, index=True)
     verification_token_expires = Column(DateTime(timezone=True), nullable=True)
 
     # Password reset
-    reset_token = Column(String(100), nullable=True)
+    reset_token_hash = Column(String(64), nullable=True, index=True)
     reset_token_expires = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     consents = relationship("Consent", back_populates="user")
     audit_logs = relationship("AuditLog", back_populates="user")
+
+
+# Email lookups compare lower(email) so any casing still hits an index;
+# unique so one address (in any casing) belongs to one account
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
@@ -1,13 +1,13 @@
 """
 Webhook Model - Real-time notifications for consent events
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-import uuid
+from sqlalchemy.sql import false, func
 import enum
 
-from app.database import Base
+from app.database import Base, UUIDString, generate_uuid
 
 
 class WebhookEvent(str, enum.Enum):
@@ -31,16 +31,27 @@ class Webhook(Base):
     Webhook Configuration - Fiduciary notification endpoints
     """
     __tablename__ = "webhooks"
-
-    id = Column(Integer, primary_key=True, index=True)
-    uuid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    __table_args__ = (
+        # Event dispatch: WHERE events @> '["consent.granted"]'
+        Index("ix_webhooks_events", "events", postgresql_using="gin",
+              postgresql_ops={"events": "jsonb_path_ops"}),
+    )
+    # Fetch created_at/updated_at via RETURNING instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUIDString, unique=True, default=generate_uuid)
     fiduciary_id = Column(Integer, ForeignKey("data_fiduciaries.id"), nullable=False)
 
     # Webhook configuration
     name = Column(String(255), nullable=False)
     url = Column(String(500), nullable=False)
     secret = Column(String(64), nullable=False)  # For HMAC signature verification
-    events = Column(Text, nullable=False)  # JSON array of WebhookEvent values
+    events = Column(JSONB, nullable=False)  # Array of WebhookEvent values
+
+    # Send queued events as one {"events": [...]} POST per delivery run
+    # instead of one POST per event (opt-in: changes the payload format)
+    batch_events = Column(Boolean, nullable=False, default=False, server_default=false())
 
     # Status
     is_active = Column(Boolean, default=True)
@@ -57,14 +68,18 @@ class WebhookDelivery(Base):
     Webhook Delivery Log - Track delivery attempts
     """
     __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        # Retry worker: find due deliveries by status, oldest first
+        Index("ix_webhook_deliveries_status_retry", "status", "next_retry_at"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    uuid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUIDString, unique=True, default=generate_uuid)
     webhook_id = Column(Integer, ForeignKey("webhooks.id"), nullable=False)
 
     # Event details
     event_type = Column(String(50), nullable=False)
-    payload = Column(Text, nullable=False)  # JSON payload sent
+    payload = Column(JSONB, nullable=False)  # Payload sent
 
     # Delivery status
     status = Column(SQLEnum(WebhookStatus), default=WebhookStatus.PENDING)
@@ -0,0 +1,36 @@
+"""
+Rate Limiting
+The one slowapi limiter shared by the application and every router.
+
+Counters live in RATE_LIMIT_STORAGE_URI. With a shared store such as
+Redis, all workers enforce the same limits, and the limits library
+checks and increments a window in a single atomic script per hit.
+"""
+from fastapi import Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.config import settings
+
+
+def client_ip_key(request: Request) -> str:
+    """
+    Rate limit key: the client IP resolved once per request by
+    ClientIPMiddleware. Behind proxies that is the X-Forwarded-For hop
+    appended by the outermost trusted proxy (TRUSTED_PROXY_COUNT from the
+    right), never a client-written entry, so rotating the header cannot
+    buy a fresh bucket.
+    """
+    return getattr(request.state, "client_ip", None) or get_remote_address(request)
+
+
+limiter = Limiter(
+    key_func=client_ip_key,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    # Fail open: if the shared store is unreachable, count in process
+    # memory until it is back, and let requests through on any other
+    # limiter error rather than failing them
+    in_memory_fallback_enabled=True,
+    swallow_errors=True,
+)
@@ -4,7 +4,8 @@ GDPR Article 30 compliance endpoints
 """
 from datetime import datetime
 from typing import Optional, List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -15,47 +16,71 @@ from app.dependencies.auth import get_current_user, get_fiduciary_by_api_key
 router = APIRouter(prefix="/api/audit-logs", tags=["Audit Logs"])
 
 
+class AuditQuery:
+    """
+    Query parameters shared by the audit log listings.
+    Parsed and validated by FastAPI before the handler runs, so malformed
+    actions or dates are rejected with 422 without touching the database.
+    """
+
+    def __init__(
+        self,
+        action: Optional[AuditAction] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = Query(100, ge=1, le=1000),
+        offset: int = Query(0, ge=0),
+        cursor_created_at: Optional[datetime] = None,
+        cursor_id: Optional[int] = None,
+    ):
+        self.action = action
+        self.start_date = start_date
+        self.end_date = end_date
+        self.limit = limit
+        self.offset = offset
+        self.cursor_created_at = cursor_created_at
+        self.cursor_id = cursor_id
+
+    def apply(self, query):
+        """Add all filters and pagination to an AuditLog query and run it"""
+        if self.action is not None:
+            query = query.filter(AuditLog.action == self.action)
+
+        if self.start_date is not None:
+            query = query.filter(AuditLog.created_at >= self.start_date)
+
+        if self.end_date is not None:
+            query = query.filter(AuditLog.created_at <= self.end_date)
+
+        offset = self.offset
+        # Keyset pagination: seek past the last row of the previous page
+        if self.cursor_created_at is not None and self.cursor_id is not None:
+            query = query.filter(
+                tuple_(AuditLog.created_at, AuditLog.id)
+                < tuple_(self.cursor_created_at, self.cursor_id)
+            )
+            offset = 0
+
+        return query.order_by(
+            AuditLog.created_at.desc(), AuditLog.id.desc()
+        ).offset(offset).limit(self.limit).all()
+
+
 @router.get("", response_model=List[AuditLogResponse])
 def get_audit_logs(
-    action: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    limit: int = 100,
-    offset: int = 0,
+    q: AuditQuery = Depends(),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get audit logs for current user (GDPR Article 30 compliance)"""
-    query = db.query(AuditLog).filter(AuditLog.user_id == current_user.id)
-
-    if action:
-        query = query.filter(AuditLog.action == AuditAction(action))
-
-    if start_date:
-        query = query.filter(AuditLog.created_at >= datetime.fromisoformat(start_date))
-
-    if end_date:
-        query = query.filter(AuditLog.created_at <= datetime.fromisoformat(end_date))
-
-    return query.order_by(
-        AuditLog.created_at.desc()
-    ).offset(offset).limit(limit).all()
+    return q.apply(db.query(AuditLog).filter(AuditLog.user_id == current_user.id))
 
 
 @router.get("/fiduciary", response_model=List[AuditLogResponse])
 def get_fiduciary_audit_logs(
-    action: Optional[str] = None,
-    limit: int = 100,
-    offset: int = 0,
+    q: AuditQuery = Depends(),
     fiduciary: DataFiduciary = Depends(get_fiduciary_by_api_key),
     db: Session = Depends(get_db)
 ):
     """Get audit logs for fiduciary (requires API key)"""
-    query = db.query(AuditLog).filter(AuditLog.fiduciary_id == fiduciary.id)
-
-    if action:
-        query = query.filter(AuditLog.action == AuditAction(action))
-
-    return query.order_by(
-        AuditLog.created_at.desc()
-    ).offset(offset).limit(limit).all()
+    return q.apply(db.query(AuditLog).filter(AuditLog.fiduciary_id == fiduciary.id))
@@ -2,14 +2,21 @@
 Authentication Router
 User and Fiduciary authentication endpoints
 """
+import hashlib
 import secrets
-from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
-from app.database import get_db, safe_commit
+from app.database import SessionLocal, get_db, safe_commit
+from app.rate_limit import limiter
 from app.config import settings
 from app.models import User, DataFiduciary, AuditAction
 from app.schemas import (
@@ -19,297 +26,522 @@ from app.schemas import (
     ForgotPasswordRequest, ResetPasswordRequest, MessageResponse
 )
 from app.services.auth import (
-    verify_password, get_password_hash, create_access_token, generate_api_key
+    verify_password, get_password_hash, create_access_token,
+    generate_api_key, api_key_columns, hash_token, password_needs_rehash,
+    UNUSABLE_PASSWORD
 )
 from app.services.audit import create_audit_log
 from app.services.email import email_service
-from app.dependencies.auth import get_current_user, get_current_fiduciary
+from app.dependencies.auth import (
+    get_current_user, get_current_fiduciary, invalidate_user, invalidate_fiduciary
+)
+from app.dependencies.clock import now_utc
 
 
 def generate_verification_token() -> str:
-    """Generate a secure random token for email verification"""
-    return secrets.token_urlsafe(32)
+    """Generate a secure random token for email verification (192 bits, 32 chars)"""
+    return secrets.token_urlsafe(24)
 
 
 def generate_reset_token() -> str:
-    """Generate a secure random token for password reset"""
-    return secrets.token_urlsafe(32)
-
-router = APIRouter(prefix="/api/auth", tags=["Authentication"])
-
-# Rate limiter instance
-limiter = Limiter(key_func=get_remote_address)
-
-
-# ========== User Authentication ==========
-
-@router.post("/register", response_model=MessageResponse)
-@limiter.limit("5/minute")
-async def register_user(
-    request: Request,
-    user_data: UserCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """Register a new data principal (user)"""
-    existing = db.query(User).filter(User.email == user_data.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Registration failed. Please try again or contact support.")
-
-    # Generate verification token
-    verification_token = generate_verification_token()
-    token_expires = datetime.now(timezone.utc) + timedelta(minutes=settings.VERIFICATION_EXPIRE_MINUTES)
-
-    user = User(
-        email=user_data.email,
-        name=user_data.name,
-        phone=user_data.phone,
-        hashed_password=get_password_hash(user_data.password),
-        email_verified=False,
-        verification_token=verification_token,
-        verification_token_expires=token_expires
-    )
-    db.add(user)
-    safe_commit(db, "register user")
-    db.refresh(user)
+    """Generate a secure random token for password reset (192 bits, 32 chars)"""
+    return secrets.token_urlsafe(24)
+
+# orjson renders the validated response content (datetimes included)
+# several times faster than the stdlib encoder behind JSONResponse
+router = APIRouter(
+    prefix="/api/auth",
+    tags=["Authentication"],
+    default_response_class=ORJSONResponse
+)
 
-    create_audit_log(
-        db, AuditAction.USER_REGISTERED, "user", user.uuid,
-        user_id=user.id,
-        details={"email": user.email},
-        ip_address=request.client.host if request.client else None
-    )
+# Hot lookups built once so every request reuses the same compiled statement.
+# Request emails arrive lower-cased (NormalizedEmail); comparing against
+# lower(column) uses the expression indexes and still matches accounts
+# registered before emails were normalized.
+USER_BY_EMAIL = select(User).where(func.lower(User.email) == bindparam("email")).limit(1)
+FIDUCIARY_BY_EMAIL = select(DataFiduciary).where(
+    func.lower(DataFiduciary.contact_email) == bindparam("email")
+).limit(1)
+
+# Login needs only these columns; rows come back as plain tuples with the
+# same attribute names, skipping ORM entity construction
+USER_LOGIN_BY_EMAIL = select(
+    User.id, User.name, User.email, User.hashed_password, User.email_verified
+).where(func.lower(User.email) == bindparam("email")).limit(1)
+FIDUCIARY_LOGIN_BY_EMAIL = select(
+    DataFiduciary.id, DataFiduciary.name, DataFiduciary.contact_email,
+    DataFiduciary.hashed_password, DataFiduciary.email_verified
+).where(func.lower(DataFiduciary.contact_email) == bindparam("email")).limit(1)
+
+
+@dataclass(frozen=True)
+class AccountSpec:
+    """What differs between the user and fiduciary auth flows"""
+    model: Any
+    role: str
+    email_field: str
+    owner_field: str
+    by_email: Any
+    login_by_email: Any
+    invalidate: Callable[[int], None]
+    token_claims: Optional[dict] = None
+
+    def email_of(self, account) -> str:
+        return getattr(account, self.email_field)
+
+
+USER_ACCOUNT = AccountSpec(
+    model=User,
+    role="user",
+    email_field="email",
+    owner_field="user_id",
+    by_email=USER_BY_EMAIL,
+    login_by_email=USER_LOGIN_BY_EMAIL,
+    invalidate=invalidate_user,
+)
+FIDUCIARY_ACCOUNT = AccountSpec(
+    model=DataFiduciary,
+    role="fiduciary",
+    email_field="contact_email",
+    owner_field="fiduciary_id",
+    by_email=FIDUCIARY_BY_EMAIL,
+    login_by_email=FIDUCIARY_LOGIN_BY_EMAIL,
+    invalidate=invalidate_fiduciary,
+    token_claims={"role": "fiduciary"},
+)
 
-    # Send verification email in background
-    background_tasks.add_task(
-        email_service.send_verification_email,
-        user.email, user.name, verification_token, "user"
+# Verified against when the email is unknown (or has no password) so every
+# failed login costs one bcrypt check and takes the same time
+_DUMMY_HASH = get_password_hash("x" * 16)
+
+# Emails that recently asked for a verification/reset link. Repeats within
+# the window get the same generic answer without any DB or email work, so
+# spraying one address costs nothing; the response never reveals whether
+# the account exists either way.
+_EMAIL_REQUEST_WINDOW_SECONDS = 60
+_recent_email_requests: TTLCache = TTLCache(maxsize=10_000, ttl=_EMAIL_REQUEST_WINDOW_SECONDS)
+_recent_email_lock = threading.Lock()
+
+_VERIFICATION_SENT = "If the email exists and is not verified, a new verification link has been sent."
+_RESET_SENT = "If the email exists, a password reset link has been sent."
+
+
+def _first_request_in_window(kind: str, email: str) -> bool:
+    """Record an email link request; False if one was serviced recently"""
+    key = (kind, hashlib.sha256(email.lower().encode()).digest())
+    with _recent_email_lock:
+        if key in _recent_email_requests:
+            return False
+        _recent_email_requests[key] = True
+        return True
+
+
+def _profile_etag(account, fields) -> str:
+    """Weak ETag over exactly the fields a profile response serializes"""
+    digest = hashlib.blake2b(
+        repr(tuple(getattr(account, name) for name in fields)).encode(),
+        digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _not_modified_or_tag(request: Request, response: Response, etag: str) -> bool:
+    """
+    Tag a profile response for revalidation. True when the client's copy is
+    current, so the caller can answer 304 without serializing the body.
+    """
+    response.headers["ETag"] = etag
+    # Clients may keep it but must revalidate; a 304 costs no body
+    response.headers["Cache-Control"] = "private, no-cache"
+    return request.headers.get("if-none-match") == etag
+
+
+def rehash_password(
+    spec: AccountSpec, principal_id: int, password: str, verified_hash: str
+) -> None:
+    """
+    Re-hash a password at the current BCRYPT_ROUNDS after a successful
+    login. Runs as a background task with its own session.
+
+    Only replaces the hash the login verified: if the password was changed
+    or reset in the meantime, the UPDATE matches nothing.
+    """
+    with SessionLocal() as db:
+        result = db.execute(
+            update(spec.model)
+            .where(
+                spec.model.id == principal_id,
+                spec.model.hashed_password == verified_hash
+            )
+            .values(hashed_password=get_password_hash(password))
+        )
+        db.commit()
+    if result.rowcount:
+        spec.invalidate(principal_id)
+
+
+# ========== Shared Account Flows ==========
+# Each user/fiduciary endpoint pair below is a thin wrapper around one of
+# these, so the route names, limits and OpenAPI schema stay as they were.
+
+def _login(spec: AccountSpec, data: UserLogin, background_tasks: BackgroundTasks, db: Session) -> AuthResponse:
+    """Check credentials and issue an access token"""
+    account = db.execute(spec.login_by_email, {"email": data.email}).first()
+    # account is a plain row: end the read so no pooled connection waits on bcrypt
+    db.rollback()
+    hashed = (
+        account.hashed_password
+        if account and account.hashed_password != UNUSABLE_PASSWORD else _DUMMY_HASH
     )
-
-    return MessageResponse(message="Registration successful. Please check your email to verify your account.")
-
-
-@router.post("/login", response_model=AuthResponse)
-@limiter.limit("10/minute")
-def login(request: Request, user_data: UserLogin, db: Session = Depends(get_db)):
-    """Login and get access token with user info"""
-    user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.hashed_password):
+    if not verify_password(data.password, hashed) or hashed is _DUMMY_HASH:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     # Check email verification
-    if not user.email_verified:
+    if not account.email_verified:
         raise HTTPException(
             status_code=403,
             detail="Email not verified. Please check your inbox for the verification link."
         )
 
-    token = create_access_token({"sub": str(user.id)})
+    if password_needs_rehash(account.hashed_password):
+        background_tasks.add_task(
+            rehash_password, spec, account.id, data.password, account.hashed_password
+        )
+
+    token = create_access_token({"sub": str(account.id), **(spec.token_claims or {})})
     return AuthResponse(
         access_token=token,
         token_type="bearer",
-        role="user",
-        name=user.name,
-        email=user.email
+        role=spec.role,
+        name=account.name,
+        email=spec.email_of(account)
     )
 
 
-@router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
-    """Get current user profile"""
-    return current_user
-
-
-# ========== User Email Verification ==========
-
-@router.post("/verify-email")
-@limiter.limit("10/minute")
-async def verify_email(
-    request: Request,
-    data: VerifyEmailRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """Verify user email with token"""
-    user = db.query(User).filter(User.verification_token == data.token).first()
+def _verify_email(
+    spec: AccountSpec, data: VerifyEmailRequest, request: Request,
+    background_tasks: BackgroundTasks, db: Session, now: datetime
+) -> dict:
+    """Mark the account owning a verification token as verified"""
+    account = db.scalars(
+        select(spec.model).where(spec.model.verification_token_hash == hash_token(data.token)).limit(1)
+    ).first()
 
-    if not user:
+    if not account:
         raise HTTPException(status_code=400, detail="Invalid or expired verification token")
 
     # Check expiration
-    if user.verification_token_expires and user.verification_token_expires < datetime.now(timezone.utc):
+    if account.verification_token_expires and account.verification_token_expires < now:
         raise HTTPException(status_code=400, detail="Verification token has expired. Please request a new one.")
 
     # Mark as verified (keep token valid for reuse within validity period)
-    was_already_verified = user.email_verified
-    user.email_verified = True
-    db.commit()
+    was_already_verified = account.email_verified
+    account.email_verified = True
 
-    # Only log and send welcome email on first verification
+    # Only log on first verification; the entry commits with the update
     if not was_already_verified:
         create_audit_log(
-            db, AuditAction.EMAIL_VERIFIED, "user", user.uuid,
-            user_id=user.id,
-            details={"email": user.email},
-            ip_address=request.client.host if request.client else None
+            db, AuditAction.EMAIL_VERIFIED, spec.role, account.uuid,
+            details={"email": spec.email_of(account)},
+            ip_address=request.state.client_ip,
+            commit=False,
+            **{spec.owner_field: account.id}
         )
+    safe_commit(db, "verify email")
+    spec.invalidate(account.id)
 
+    if not was_already_verified:
         # Send welcome email
         background_tasks.add_task(
             email_service.send_welcome_email,
-            user.email, user.name, "user"
+            spec.email_of(account), account.name, spec.role
         )
 
-    return {"message": "Email verified successfully.", "account_type": "user"}
+    return {"message": "Email verified successfully.", "account_type": spec.role}
 
 
-@router.post("/resend-verification", response_model=MessageResponse)
-@limiter.limit("3/minute")
-async def resend_verification(
-    request: Request,
-    data: ResendVerificationRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """Resend verification email"""
+def _resend_verification(
+    spec: AccountSpec, data: ResendVerificationRequest,
+    background_tasks: BackgroundTasks, db: Session, now: datetime
+) -> MessageResponse:
+    """Issue a fresh verification token to an unverified account"""
     # Always return success to prevent user enumeration
-    user = db.query(User).filter(User.email == data.email).first()
+    if not _first_request_in_window(f"{spec.role}-verification", data.email):
+        return MessageResponse(message=_VERIFICATION_SENT)
+    account = db.scalars(spec.by_email, {"email": data.email}).first()
 
-    if user and not user.email_verified:
+    if account and not account.email_verified:
         # Generate new token
         verification_token = generate_verification_token()
-        token_expires = datetime.now(timezone.utc) + timedelta(minutes=settings.VERIFICATION_EXPIRE_MINUTES)
+        token_expires = now + timedelta(minutes=settings.VERIFICATION_EXPIRE_MINUTES)
 
-        user.verification_token = verification_token
-        user.verification_token_expires = token_expires
+        account.verification_token_hash = hash_token(verification_token)
+        account.verification_token_expires = token_expires
         db.commit()
 
         background_tasks.add_task(
             email_service.send_verification_email,
-            user.email, user.name, verification_token, "user"
+            spec.email_of(account), account.name, verification_token, spec.role
         )
 
-    return MessageResponse(message="If the email exists and is not verified, a new verification link has been sent.")
-
+    return MessageResponse(message=_VERIFICATION_SENT)
 
-# ========== User Password Reset ==========
 
-@router.post("/forgot-password", response_model=MessageResponse)
-@limiter.limit("5/minute")
-async def forgot_password(
-    request: Request,
-    data: ForgotPasswordRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """Request password reset email"""
+def _forgot_password(
+    spec: AccountSpec, data: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks, db: Session, now: datetime
+) -> MessageResponse:
+    """Email a password reset token if the account exists"""
     # Always return success to prevent user enumeration
-    user = db.query(User).filter(User.email == data.email).first()
+    if not _first_request_in_window(f"{spec.role}-reset", data.email):
+        return MessageResponse(message=_RESET_SENT)
+    account = db.scalars(spec.by_email, {"email": data.email}).first()
 
-    if user:
+    if account:
         # Generate reset token
         reset_token = generate_reset_token()
-        token_expires = datetime.now(timezone.utc) + timedelta(minutes=settings.RESET_EXPIRE_MINUTES)
+        token_expires = now + timedelta(minutes=settings.RESET_EXPIRE_MINUTES)
 
-        user.reset_token = reset_token
-        user.reset_token_expires = token_expires
+        account.reset_token_hash = hash_token(reset_token)
+        account.reset_token_expires = token_expires
         db.commit()
 
         background_tasks.add_task(
             email_service.send_password_reset_email,
-            user.email, user.name, reset_token, "user"
+            spec.email_of(account), account.name, reset_token, spec.role
         )
 
-    return MessageResponse(message="If the email exists, a password reset link has been sent.")
+    return MessageResponse(message=_RESET_SENT)
 
 
-@router.post("/reset-password", response_model=MessageResponse)
-@limiter.limit("5/minute")
-async def reset_password(
-    request: Request,
-    data: ResetPasswordRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """Reset password with token"""
-    user = db.query(User).filter(User.reset_token == data.token).first()
+def _reset_password(
+    spec: AccountSpec, data: ResetPasswordRequest, request: Request,
+    background_tasks: BackgroundTasks, db: Session, now: datetime
+) -> MessageResponse:
+    """Set a new password for the account owning a reset token"""
+    # Hash before the lookup so no pooled connection waits on bcrypt
+    new_hash = get_password_hash(data.new_password)
+    account = db.scalars(
+        select(spec.model).where(spec.model.reset_token_hash == hash_token(data.token)).limit(1)
+    ).first()
 
-    if not user:
+    if not account:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
 
     # Check expiration
-    if user.reset_token_expires and user.reset_token_expires < datetime.now(timezone.utc):
+    if account.reset_token_expires and account.reset_token_expires < now:
         raise HTTPException(status_code=400, detail="Reset token has expired. Please request a new one.")
 
     # Update password
-    user.hashed_password = get_password_hash(data.new_password)
-    user.reset_token = None
-    user.reset_token_expires = None
-    db.commit()
+    account.hashed_password = new_hash
+    account.reset_token_hash = None
+    account.reset_token_expires = None
 
+    # Audit entry commits together with the password change
     create_audit_log(
-        db, AuditAction.PASSWORD_RESET, "user", user.uuid,
-        user_id=user.id,
-        details={"email": user.email},
-        ip_address=request.client.host if request.client else None
+        db, AuditAction.PASSWORD_RESET, spec.role, account.uuid,
+        details={"email": spec.email_of(account)},
+        ip_address=request.state.client_ip,
+        commit=False,
+        **{spec.owner_field: account.id}
     )
+    safe_commit(db, "reset password")
+    spec.invalidate(account.id)
 
     # Notify user
     background_tasks.add_task(
         email_service.send_password_changed_email,
-        user.email, user.name
+        spec.email_of(account), account.name
     )
 
     return MessageResponse(message="Password reset successfully. You can now login with your new password.")
 
 
+# ========== User Authentication ==========
+
+@router.post("/register", response_model=MessageResponse)
+@limiter.limit("5/minute")
+def register_user(
+    request: Request,
+    user_data: UserCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
+):
+    """Register a new data principal (user)"""
+    # Generate verification token
+    verification_token = generate_verification_token()
+    token_expires = now + timedelta(minutes=settings.VERIFICATION_EXPIRE_MINUTES)
+
+    # One statement: the unique lower(email) index decides, race-free,
+    # whether the address is taken in any casing (no row comes back)
+    created = db.execute(
+        pg_insert(User).values(
+            email=user_data.email,
+            name=user_data.name,
+            phone=user_data.phone,
+            hashed_password=get_password_hash(user_data.password),
+            email_verified=False,
+            verification_token_hash=hash_token(verification_token),
+            verification_token_expires=token_expires
+        ).on_conflict_do_nothing(
+            index_elements=[func.lower(User.email)]
+        ).returning(User.id, User.uuid)
+    ).first()
+    if created is None:
+        raise HTTPException(status_code=400, detail="Registration failed. Please try again or contact support.")
+
+    # Audit entry commits together with the new account
+    create_audit_log(
+        db, AuditAction.USER_REGISTERED, "user", created.uuid,
+        user_id=created.id,
+        details={"email": user_data.email},
+        ip_address=request.state.client_ip,
+        commit=False
+    )
+    safe_commit(db, "register user")
+
+    # Send verification email in background
+    background_tasks.add_task(
+        email_service.send_verification_email,
+        user_data.email, user_data.name, verification_token, "user"
+    )
+
+    return MessageResponse(message="Registration successful. Please check your email to verify your account.")
+
+
+@router.post("/login", response_model=AuthResponse)
+@limiter.limit("10/minute")
+def login(
+    request: Request,
+    user_data: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Login and get access token with user info"""
+    return _login(USER_ACCOUNT, user_data, background_tasks, db)
+
+
+@router.get("/me", response_model=UserResponse)
+async def get_me(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """Get current user profile"""
+    etag = _profile_etag(current_user, UserResponse.model_fields)
+    if _not_modified_or_tag(request, response, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return current_user
+
+
+# ========== User Email Verification ==========
+
+@router.post("/verify-email")
+@limiter.limit("10/minute")
+def verify_email(
+    request: Request,
+    data: VerifyEmailRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
+):
+    """Verify user email with token"""
+    return _verify_email(USER_ACCOUNT, data, request, background_tasks, db, now)
+
+
+@router.post("/resend-verification", response_model=MessageResponse)
+@limiter.limit("3/minute")
+def resend_verification(
+    request: Request,
+    data: ResendVerificationRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
+):
+    """Resend verification email"""
+    return _resend_verification(USER_ACCOUNT, data, background_tasks, db, now)
+
+
+# ========== User Password Reset ==========
+
+@router.post("/forgot-password", response_model=MessageResponse)
+@limiter.limit("5/minute")
+def forgot_password(
+    request: Request,
+    data: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
+):
+    """Request password reset email"""
+    return _forgot_password(USER_ACCOUNT, data, background_tasks, db, now)
+
+
+@router.post("/reset-password", response_model=MessageResponse)
+@limiter.limit("5/minute")
+def reset_password(
+    request: Request,
+    data: ResetPasswordRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
+):
+    """Reset password with token"""
+    return _reset_password(USER_ACCOUNT, data, request, background_tasks, db, now)
+
+
 # ========== Fiduciary Authentication ==========
 
 @router.post("/fiduciary/register", response_model=MessageResponse)
 @limiter.limit("5/minute")
-async def register_fiduciary(
+def register_fiduciary(
     request: Request,
     data: FiduciaryRegister,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
 ):
     """Register a new data fiduciary (company)"""
-    existing = db.query(DataFiduciary).filter(
-        DataFiduciary.contact_email == data.contact_email
-    ).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Registration failed. Please try again or contact support.")
-
     # Generate verification token
     verification_token = generate_verification_token()
-    token_expires = datetime.now(timezone.utc) + timedelta(minutes=settings.VERIFICATION_EXPIRE_MINUTES)
-
-    fiduciary = DataFiduciary(
-        name=data.name,
-        description=data.description,
-        privacy_policy_url=data.privacy_policy_url,
-        contact_email=data.contact_email,
-        hashed_password=get_password_hash(data.password),
-        api_key=generate_api_key(),
-        email_verified=False,
-        verification_token=verification_token,
-        verification_token_expires=token_expires
-    )
-    db.add(fiduciary)
-    safe_commit(db, "register fiduciary")
-    db.refresh(fiduciary)
+    token_expires = now + timedelta(minutes=settings.VERIFICATION_EXPIRE_MINUTES)
+
+    # Single INSERT; a contact email taken in any casing returns no row
+    created = db.execute(
+        pg_insert(DataFiduciary).values(
+            name=data.name,
+            description=data.description,
+            privacy_policy_url=data.privacy_policy_url,
+            contact_email=data.contact_email,
+            hashed_password=get_password_hash(data.password),
+            email_verified=False,
+            verification_token_hash=hash_token(verification_token),
+            verification_token_expires=token_expires,
+            # Key is shown only via regeneration; store just its hash
+            **api_key_columns(generate_api_key())
+        ).on_conflict_do_nothing(
+            index_elements=[func.lower(DataFiduciary.contact_email)]
+        ).returning(DataFiduciary.id, DataFiduciary.uuid)
+    ).first()
+    if created is None:
+        raise HTTPException(status_code=400, detail="Registration failed. Please try again or contact support.")
 
+    # Audit entry commits together with the new account
     create_audit_log(
-        db, AuditAction.USER_REGISTERED, "fiduciary", fiduciary.uuid,
-        fiduciary_id=fiduciary.id,
-        details={"name": fiduciary.name, "email": fiduciary.contact_email},
-        ip_address=request.client.host if request.client else None
+        db, AuditAction.USER_REGISTERED, "fiduciary", created.uuid,
+        fiduciary_id=created.id,
+        details={"name": data.name, "email": data.contact_email},
+        ip_address=request.state.client_ip,
+        commit=False
     )
+    safe_commit(db, "register fiduciary")
 
     # Send verification email in background
     background_tasks.add_task(
         email_service.send_verification_email,
-        fiduciary.contact_email, fiduciary.name, verification_token, "fiduciary"
+        data.contact_email, data.name, verification_token, "fiduciary"
     )
 
     return MessageResponse(message="Registration successful. Please check your email to verify your account.")
@@ -317,199 +549,82 @@ async def register_fiduciary(
 
 @router.post("/fiduciary/login", response_model=AuthResponse)
 @limiter.limit("10/minute")
-def login_fiduciary(request: Request, data: UserLogin, db: Session = Depends(get_db)):
+def login_fiduciary(
+    request: Request,
+    data: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Login as data fiduciary"""
-    fiduciary = db.query(DataFiduciary).filter(
-        DataFiduciary.contact_email == data.email
-    ).first()
-
-    if not fiduciary or not fiduciary.hashed_password:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
-    if not verify_password(data.password, fiduciary.hashed_password):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
-    # Check email verification
-    if not fiduciary.email_verified:
-        raise HTTPException(
-            status_code=403,
-            detail="Email not verified. Please check your inbox for the verification link."
-        )
-
-    token = create_access_token({"sub": str(fiduciary.id), "role": "fiduciary"})
-    return AuthResponse(
-        access_token=token,
-        token_type="bearer",
-        role="fiduciary",
-        name=fiduciary.name,
-        email=fiduciary.contact_email
-    )
+    return _login(FIDUCIARY_ACCOUNT, data, background_tasks, db)
 
 
 @router.get("/fiduciary/me", response_model=DataFiduciaryWithMaskedKey)
-def get_fiduciary_me(
+async def get_fiduciary_me(
+    request: Request,
+    response: Response,
     current_fiduciary: DataFiduciary = Depends(get_current_fiduciary)
 ):
     """Get current fiduciary profile with masked API key"""
-    api_key = current_fiduciary.api_key or ""
-    # Mask the API key: show first 8 and last 4 characters
-    prefix = api_key[:8] if len(api_key) >= 8 else api_key
-    suffix = api_key[-4:] if len(api_key) >= 4 else ""
-    hint = f"{prefix}****{suffix}" if len(api_key) > 12 else "****"
-
-    return DataFiduciaryWithMaskedKey(
-        id=current_fiduciary.id,
-        uuid=current_fiduciary.uuid,
-        name=current_fiduciary.name,
-        description=current_fiduciary.description,
-        privacy_policy_url=current_fiduciary.privacy_policy_url,
-        contact_email=current_fiduciary.contact_email,
-        is_active=current_fiduciary.is_active,
-        created_at=current_fiduciary.created_at,
-        api_key_prefix=prefix,
-        api_key_suffix=suffix,
-        api_key_hint=hint
-    )
+    # Masked key fields are stored when the key is issued, so a regenerated
+    # key changes the ETag along with any profile edit
+    etag = _profile_etag(current_fiduciary, DataFiduciaryWithMaskedKey.model_fields)
+    if _not_modified_or_tag(request, response, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return current_fiduciary
 
 
 # ========== Fiduciary Email Verification ==========
 
 @router.post("/fiduciary/verify-email")
 @limiter.limit("10/minute")
-async def verify_fiduciary_email(
+def verify_fiduciary_email(
     request: Request,
     data: VerifyEmailRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
 ):
     """Verify fiduciary email with token"""
-    fiduciary = db.query(DataFiduciary).filter(DataFiduciary.verification_token == data.token).first()
-
-    if not fiduciary:
-        raise HTTPException(status_code=400, detail="Invalid or expired verification token")
-
-    # Check expiration
-    if fiduciary.verification_token_expires and fiduciary.verification_token_expires < datetime.now(timezone.utc):
-        raise HTTPException(status_code=400, detail="Verification token has expired. Please request a new one.")
-
-    # Mark as verified (keep token valid for reuse within validity period)
-    was_already_verified = fiduciary.email_verified
-    fiduciary.email_verified = True
-    db.commit()
-
-    # Only log and send welcome email on first verification
-    if not was_already_verified:
-        create_audit_log(
-            db, AuditAction.EMAIL_VERIFIED, "fiduciary", fiduciary.uuid,
-            fiduciary_id=fiduciary.id,
-            details={"email": fiduciary.contact_email},
-            ip_address=request.client.host if request.client else None
-        )
-
-        # Send welcome email
-        background_tasks.add_task(
-            email_service.send_welcome_email,
-            fiduciary.contact_email, fiduciary.name, "fiduciary"
-        )
-
-    return {"message": "Email verified successfully.", "account_type": "fiduciary"}
+    return _verify_email(FIDUCIARY_ACCOUNT, data, request, background_tasks, db, now)
 
 
 @router.post("/fiduciary/resend-verification", response_model=MessageResponse)
 @limiter.limit("3/minute")
-async def resend_fiduciary_verification(
+def resend_fiduciary_verification(
     request: Request,
     data: ResendVerificationRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
 ):
     """Resend verification email for fiduciary"""
-    # Always return success to prevent user enumeration
-    fiduciary = db.query(DataFiduciary).filter(DataFiduciary.contact_email == data.email).first()
-
-    if fiduciary and not fiduciary.email_verified:
-        # Generate new token
-        verification_token = generate_verification_token()
-        token_expires = datetime.now(timezone.utc) + timedelta(minutes=settings.VERIFICATION_EXPIRE_MINUTES)
-
-        fiduciary.verification_token = verification_token
-        fiduciary.verification_token_expires = token_expires
-        db.commit()
-
-        background_tasks.add_task(
-            email_service.send_verification_email,
-            fiduciary.contact_email, fiduciary.name, verification_token, "fiduciary"
-        )
-
-    return MessageResponse(message="If the email exists and is not verified, a new verification link has been sent.")
+    return _resend_verification(FIDUCIARY_ACCOUNT, data, background_tasks, db, now)
 
 
 # ========== Fiduciary Password Reset ==========
 
 @router.post("/fiduciary/forgot-password", response_model=MessageResponse)
 @limiter.limit("5/minute")
-async def fiduciary_forgot_password(
+def fiduciary_forgot_password(
     request: Request,
     data: ForgotPasswordRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
 ):
     """Request password reset email for fiduciary"""
-    # Always return success to prevent user enumeration
-    fiduciary = db.query(DataFiduciary).filter(DataFiduciary.contact_email == data.email).first()
-
-    if fiduciary:
-        # Generate reset token
-        reset_token = generate_reset_token()
-        token_expires = datetime.now(timezone.utc) + timedelta(minutes=settings.RESET_EXPIRE_MINUTES)
-
-        fiduciary.reset_token = reset_token
-        fiduciary.reset_token_expires = token_expires
-        db.commit()
-
-        background_tasks.add_task(
-            email_service.send_password_reset_email,
-            fiduciary.contact_email, fiduciary.name, reset_token, "fiduciary"
-        )
-
-    return MessageResponse(message="If the email exists, a password reset link has been sent.")
+    return _forgot_password(FIDUCIARY_ACCOUNT, data, background_tasks, db, now)
 
 
 @router.post("/fiduciary/reset-password", response_model=MessageResponse)
 @limiter.limit("5/minute")
-async def fiduciary_reset_password(
+def fiduciary_reset_password(
     request: Request,
     data: ResetPasswordRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc)
 ):
     """Reset fiduciary password with token"""
-    fiduciary = db.query(DataFiduciary).filter(DataFiduciary.reset_token == data.token).first()
-
-    if not fiduciary:
-        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
-
-    # Check expiration
-    if fiduciary.reset_token_expires and fiduciary.reset_token_expires < datetime.now(timezone.utc):
-        raise HTTPException(status_code=400, detail="Reset token has expired. Please request a new one.")
-
-    # Update password
-    fiduciary.hashed_password = get_password_hash(data.new_password)
-    fiduciary.reset_token = None
-    fiduciary.reset_token_expires = None
-    db.commit()
-
-    create_audit_log(
-        db, AuditAction.PASSWORD_RESET, "fiduciary", fiduciary.uuid,
-        fiduciary_id=fiduciary.id,
-        details={"email": fiduciary.contact_email},
-        ip_address=request.client.host if request.client else None
-    )
-
-    # Notify user
-    background_tasks.add_task(
-        email_service.send_password_changed_email,
-        fiduciary.contact_email, fiduciary.name
-    )
-
-    return MessageResponse(message="Password reset successfully. You can now login with your new password.")
+    return _reset_password(FIDUCIARY_ACCOUNT, data, request, background_tasks, db, now)
@@ -10,18 +10,19 @@ This module handles all consent lifecycle operations including:
 
 All operations are logged for audit compliance.
 """
-import json
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 import io
 
 from app.database import get_db, safe_commit
+from app.rate_limit import limiter
 from app.constants import ErrorMessages
 from app.models import (
     User, DataFiduciary, Purpose, Consent, ConsentReceipt,
@@ -29,15 +30,15 @@ from app.models import (
 )
 from app.schemas import (
     ConsentGrantRequest, ConsentRevokeRequest, ConsentRenewRequest,
-    ConsentResponse, ConsentDetailResponse, ConsentReceiptResponse,
-    PurposeResponse, DataFiduciaryResponse
+    ConsentResponse, ConsentDetailResponse, ConsentReceiptResponse
 )
+from app.services.cache import get_fiduciary, get_purpose
 from app.services.consent import generate_consent_receipt
 from app.services.audit import create_audit_log
-from app.services.webhook import trigger_consent_webhooks
-from app.services.pdf import generate_consent_receipt_pdf
+from app.services.webhook import enqueue_consent_webhooks, notify_webhook_worker
+from app.services.pdf import get_consent_receipt_pdf, receipt_pdf_key
 from app.services.expiry import (
-    check_and_update_expired_consent,
+    expire_lapsed_consents,
     get_user_expiring_consents,
     renew_consent as renew_consent_service,
     get_days_until_expiry,
@@ -49,8 +50,27 @@ from app.models.webhook import WebhookEvent
 
 router = APIRouter(prefix="/api/consents", tags=["Consents"])
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+
+def _get_owned_consent_receipt(db: Session, uuid: str, user_id: int):
+    """
+    Fetch a user's consent with its latest receipt, purpose and fiduciary
+    in one query. Raises 404 if the consent or its receipt is missing.
+    """
+    row = db.execute(
+        select(Consent, ConsentReceipt, Purpose, DataFiduciary)
+        .join(Purpose, Purpose.id == Consent.purpose_id)
+        .join(DataFiduciary, DataFiduciary.id == Consent.fiduciary_id)
+        .outerjoin(ConsentReceipt, ConsentReceipt.consent_id == Consent.id)
+        .where(Consent.uuid == uuid, Consent.user_id == user_id)
+        .order_by(ConsentReceipt.issued_at.desc())
+        .limit(1)
+    ).first()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail=ErrorMessages.CONSENT_NOT_FOUND)
+    if row.ConsentReceipt is None:
+        raise HTTPException(status_code=404, detail=ErrorMessages.not_found("Receipt"))
+    return row
 
 
 @router.post("/grant", response_model=ConsentReceiptResponse)
@@ -62,63 +82,68 @@ def grant_consent(
     db: Session = Depends(get_db)
 ):
     """Grant consent for a specific purpose (DPDP Section 6)"""
-    # Get fiduciary
-    fiduciary = db.query(DataFiduciary).filter(
-        DataFiduciary.uuid == data.fiduciary_uuid
+    # One round trip: the fiduciary and its purpose (NULL if the id belongs
+    # to another fiduciary)
+    row = db.execute(
+        select(DataFiduciary, Purpose)
+        .outerjoin(Purpose, and_(
+            Purpose.id == data.purpose_id,
+            Purpose.fiduciary_id == DataFiduciary.id
+        ))
+        .where(DataFiduciary.uuid == data.fiduciary_uuid)
+        .limit(1)
     ).first()
-    if not fiduciary:
-        raise HTTPException(status_code=404, detail="Fiduciary not found")
 
-    # Get purpose
-    purpose = db.query(Purpose).filter(
-        Purpose.id == data.purpose_id,
-        Purpose.fiduciary_id == fiduciary.id
-    ).first()
-    if not purpose:
+    if row is None:
+        raise HTTPException(status_code=404, detail="Fiduciary not found")
+    fiduciary, purpose = row.DataFiduciary, row.Purpose
+    if purpose is None:
         raise HTTPException(status_code=404, detail="Purpose not found")
 
-    # Check for existing active consent
-    existing = db.query(Consent).filter(
-        Consent.user_id == current_user.id,
-        Consent.purpose_id == purpose.id,
-        Consent.status == ConsentStatus.GRANTED
-    ).first()
-
-    if existing:
+    # Recorded on both the consent and its audit entry; read once so the
+    # two always agree
+    ip_address = request.state.client_ip
+    user_agent = request.headers.get("user-agent")
+
+    # Create consent: INSERT ... RETURNING hands back the complete row (id,
+    # granted_at and expires_at from the database clock) in one round trip.
+    # An active consent for this purpose already holds the partial unique
+    # index, so the insert is skipped and nothing is returned.
+    consent = db.scalars(
+        insert(Consent).values(
+            user_id=current_user.id,
+            fiduciary_id=fiduciary.id,
+            purpose_id=purpose.id,
+            status=ConsentStatus.GRANTED,
+            expires_at=func.now() + timedelta(days=purpose.retention_period_days),
+            ip_address=ip_address,
+            user_agent=user_agent
+        ).on_conflict_do_nothing(
+            index_elements=[Consent.user_id, Consent.purpose_id],
+            index_where=text("status = 'GRANTED'")
+        ).returning(Consent)
+    ).one_or_none()
+
+    if consent is None:
         raise HTTPException(
             status_code=400,
             detail="Consent already granted for this purpose"
         )
 
-    # Create consent
-    consent = Consent(
-        user_id=current_user.id,
-        fiduciary_id=fiduciary.id,
-        purpose_id=purpose.id,
-        status=ConsentStatus.GRANTED,
-        expires_at=datetime.utcnow() + timedelta(days=purpose.retention_period_days),
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent")
+    # Receipt, audit entry and queued webhooks commit together with the consent
+    receipt = generate_consent_receipt(
+        db, consent, current_user, purpose, fiduciary, commit=False
     )
-    db.add(consent)
-    safe_commit(db, "grant consent")
-    db.refresh(consent)
-
-    # Generate receipt
-    receipt = generate_consent_receipt(db, consent, current_user, purpose, fiduciary)
-
-    # Audit log
     create_audit_log(
         db, AuditAction.CONSENT_GRANTED, "consent", consent.uuid,
         user_id=current_user.id, fiduciary_id=fiduciary.id,
         details={"purpose": purpose.name},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent")
+        ip_address=ip_address,
+        user_agent=user_agent,
+        commit=False
     )
-
-    # Trigger webhooks
-    trigger_consent_webhooks(
-        db=db,
+    enqueue_consent_webhooks(
+        db,
         fiduciary_id=fiduciary.id,
         event_type=WebhookEvent.CONSENT_GRANTED.value,
         consent_data={
@@ -130,6 +155,8 @@ def grant_consent(
             "expires_at": consent.expires_at.isoformat() if consent.expires_at else None
         }
     )
+    safe_commit(db, "grant consent")
+    notify_webhook_worker()
 
     return ConsentReceiptResponse(
         receipt_id=receipt.receipt_id,
@@ -139,7 +166,7 @@ def grant_consent(
         fiduciary_name=fiduciary.name,
         purpose_name=purpose.name,
         purpose_description=purpose.description,
-        data_categories=json.loads(purpose.data_categories),
+        data_categories=purpose.data_categories,
         legal_basis=purpose.legal_basis,
         retention_period_days=purpose.retention_period_days,
         granted_at=consent.granted_at,
@@ -158,10 +185,10 @@ def revoke_consent(
     db: Session = Depends(get_db)
 ):
     """Revoke consent (DPDP Section 6(6) - Right to Withdraw)"""
-    consent = db.query(Consent).filter(
+    consent = db.scalar(select(Consent).where(
         Consent.uuid == data.consent_uuid,
         Consent.user_id == current_user.id
-    ).first()
+    ))
 
     if not consent:
         raise HTTPException(status_code=404, detail="Consent not found")
@@ -170,22 +197,21 @@ def revoke_consent(
         raise HTTPException(status_code=400, detail="Consent already revoked")
 
     consent.status = ConsentStatus.REVOKED
-    consent.revoked_at = datetime.utcnow()
-    safe_commit(db, "revoke consent")
-    db.refresh(consent)
+    consent.revoked_at = func.now()  # fetched back via UPDATE ... RETURNING
+    db.flush()
 
+    # Audit entry and queued webhooks commit together with the revocation
     create_audit_log(
         db, AuditAction.CONSENT_REVOKED, "consent", consent.uuid,
         user_id=current_user.id, fiduciary_id=consent.fiduciary_id,
         details={"reason": data.reason},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent")
+        ip_address=request.state.client_ip,
+        user_agent=request.headers.get("user-agent"),
+        commit=False
     )
-
-    # Trigger webhooks
-    purpose = db.query(Purpose).filter(Purpose.id == consent.purpose_id).first()
-    trigger_consent_webhooks(
-        db=db,
+    purpose = get_purpose(db, consent.purpose_id)
+    enqueue_consent_webhooks(
+        db,
         fiduciary_id=consent.fiduciary_id,
         event_type=WebhookEvent.CONSENT_REVOKED.value,
         consent_data={
@@ -197,6 +223,8 @@ def revoke_consent(
             "reason": data.reason
         }
     )
+    safe_commit(db, "revoke consent")
+    notify_webhook_worker()
 
     return consent
 
@@ -205,35 +233,33 @@ def revoke_consent(
 @limiter.limit("60/minute")
 def list_my_consents(
     request: Request,
-    status: Optional[str] = None,
+    status: Optional[ConsentStatus] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """List all consents for current user"""
-    query = db.query(Consent).filter(Consent.user_id == current_user.id)
+    # Bring statuses up to date with one UPDATE before reading, instead of
+    # checking (and committing) each listed consent
+    expire_lapsed_consents(db, user_id=current_user.id)
+
+    # Purpose and fiduciary come back in the same query (no per-row lookups)
+    stmt = select(Consent).options(
+        joinedload(Consent.purpose),
+        joinedload(Consent.fiduciary)
+    ).where(Consent.user_id == current_user.id)
 
     if status:
-        query = query.filter(Consent.status == ConsentStatus(status))
-
-    consents = query.order_by(Consent.granted_at.desc()).all()
-
-    # Check and update expired consents on-demand
-    for c in consents:
-        check_and_update_expired_consent(db, c)
-
-    result = []
-    for c in consents:
-        purpose = db.query(Purpose).filter(Purpose.id == c.purpose_id).first()
-        fiduciary = db.query(DataFiduciary).filter(
-            DataFiduciary.id == c.fiduciary_id
-        ).first()
-        result.append(ConsentDetailResponse(
-            consent=ConsentResponse.model_validate(c),
-            purpose=PurposeResponse.model_validate(purpose),
-            fiduciary=DataFiduciaryResponse.model_validate(fiduciary)
-        ))
+        stmt = stmt.where(Consent.status == status)
+
+    consents = db.scalars(stmt.order_by(Consent.granted_at.desc())).all()
 
-    return result
+    # Plain rows of ORM objects: the response_model validates them once, in
+    # a single from_attributes pass, instead of building models per row
+    # here that FastAPI would dump and validate again
+    return [
+        {"consent": c, "purpose": c.purpose, "fiduciary": c.fiduciary}
+        for c in consents
+    ]
 
 
 @router.get("/{uuid}/receipt", response_model=ConsentReceiptResponse)
@@ -245,24 +271,7 @@ def get_consent_receipt(
     db: Session = Depends(get_db)
 ):
     """Get consent receipt (DPDP Section 6(3) Transparency)"""
-    consent = db.query(Consent).filter(
-        Consent.uuid == uuid,
-        Consent.user_id == current_user.id
-    ).first()
-
-    if not consent:
-        raise HTTPException(status_code=404, detail="Consent not found")
-
-    receipt = db.query(ConsentReceipt).filter(
-        ConsentReceipt.consent_id == consent.id
-    ).first()
-    if not receipt:
-        raise HTTPException(status_code=404, detail="Receipt not found")
-
-    purpose = db.query(Purpose).filter(Purpose.id == consent.purpose_id).first()
-    fiduciary = db.query(DataFiduciary).filter(
-        DataFiduciary.id == consent.fiduciary_id
-    ).first()
+    consent, receipt, purpose, fiduciary = _get_owned_consent_receipt(db, uuid, current_user.id)
 
     return ConsentReceiptResponse(
         receipt_id=receipt.receipt_id,
@@ -272,7 +281,7 @@ def get_consent_receipt(
         fiduciary_name=fiduciary.name,
         purpose_name=purpose.name,
         purpose_description=purpose.description,
-        data_categories=json.loads(purpose.data_categories),
+        data_categories=purpose.data_categories,
         legal_basis=purpose.legal_basis,
         retention_period_days=purpose.retention_period_days,
         granted_at=consent.granted_at,
@@ -306,35 +315,16 @@ def download_consent_receipt_pdf(
         db: Database session.
 
     Returns:
-        StreamingResponse with PDF file attachment.
+        Response with PDF file attachment, or 304 if the client's
+        copy (If-None-Match) is still current.
 
     Raises:
         HTTPException 404: If consent or receipt not found.
     """
-    # Fetch consent with ownership verification
-    consent = db.query(Consent).filter(
-        Consent.uuid == uuid,
-        Consent.user_id == current_user.id
-    ).first()
-
-    if not consent:
-        raise HTTPException(status_code=404, detail=ErrorMessages.CONSENT_NOT_FOUND)
+    # Consent (ownership verified), receipt and related entities in one query
+    consent, receipt, purpose, fiduciary = _get_owned_consent_receipt(db, uuid, current_user.id)
 
-    # Fetch related receipt
-    receipt = db.query(ConsentReceipt).filter(
-        ConsentReceipt.consent_id == consent.id
-    ).first()
-    if not receipt:
-        raise HTTPException(status_code=404, detail=ErrorMessages.not_found("Receipt"))
-
-    # Fetch related entities
-    purpose = db.query(Purpose).filter(Purpose.id == consent.purpose_id).first()
-    fiduciary = db.query(DataFiduciary).filter(
-        DataFiduciary.id == consent.fiduciary_id
-    ).first()
-
-    # Generate PDF using service
-    pdf_buffer = generate_consent_receipt_pdf(
+    receipt_fields = dict(
         receipt_id=receipt.receipt_id,
         consent_uuid=consent.uuid,
         status=consent.status.value,
@@ -347,16 +337,27 @@ def download_consent_receipt_pdf(
         purpose_name=purpose.name,
         purpose_description=purpose.description,
         legal_basis=purpose.legal_basis,
-        data_categories=json.loads(purpose.data_categories),
+        data_categories=purpose.data_categories,
         retention_days=purpose.retention_period_days,
         signature=receipt.signature
     )
-
-    return StreamingResponse(
-        pdf_buffer,
+    key = receipt_pdf_key(**receipt_fields)
+    cache_headers = {"ETag": f'"{key}"', "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == cache_headers["ETag"]:
+        return Response(status_code=304, headers=cache_headers)
+
+    # Repeat downloads come from the cache; ReportLab runs only on a miss
+    pdf_bytes = get_consent_receipt_pdf(key, **receipt_fields)
+
+    # The PDF is already complete in memory: send the cached bytes as the
+    # body (one write, with Content-Length) rather than streaming a BytesIO
+    # copy line by line through the threadpool
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f"attachment; filename=consent-receipt-{consent.uuid}.pdf"
+            "Content-Disposition": f"attachment; filename=consent-receipt-{consent.uuid}.pdf",
+            **cache_headers
         }
     )
 
@@ -370,21 +371,13 @@ def list_expiring_consents(
     db: Session = Depends(get_db)
 ):
     """List consents expiring within X days (default 14 days)"""
+    # Purpose and fiduciary are joined-loaded with the consents
     expiring = get_user_expiring_consents(db, current_user.id, days)
 
-    result = []
-    for c in expiring:
-        purpose = db.query(Purpose).filter(Purpose.id == c.purpose_id).first()
-        fiduciary = db.query(DataFiduciary).filter(
-            DataFiduciary.id == c.fiduciary_id
-        ).first()
-        result.append(ConsentDetailResponse(
-            consent=ConsentResponse.model_validate(c),
-            purpose=PurposeResponse.model_validate(purpose),
-            fiduciary=DataFiduciaryResponse.model_validate(fiduciary)
-        ))
-
-    return result
+    return [
+        {"consent": c, "purpose": c.purpose, "fiduciary": c.fiduciary}
+        for c in expiring
+    ]
 
 
 @router.post("/renew", response_model=ConsentReceiptResponse)
@@ -396,10 +389,10 @@ def renew_consent(
     db: Session = Depends(get_db)
 ):
     """Renew an expiring or expired consent (DPDP Section 6(7))"""
-    consent = db.query(Consent).filter(
+    consent = db.scalar(select(Consent).where(
         Consent.uuid == data.consent_uuid,
         Consent.user_id == current_user.id
-    ).first()
+    ))
 
     if not consent:
         raise HTTPException(status_code=404, detail="Consent not found")
@@ -410,16 +403,22 @@ def renew_consent(
             detail="Cannot renew a revoked consent. Please grant a new consent."
         )
 
-    purpose = db.query(Purpose).filter(Purpose.id == consent.purpose_id).first()
+    purpose = get_purpose(db, consent.purpose_id)
     if not purpose:
         raise HTTPException(status_code=404, detail="Purpose not found")
 
-    fiduciary = db.query(DataFiduciary).filter(
-        DataFiduciary.id == consent.fiduciary_id
-    ).first()
+    fiduciary = get_fiduciary(db, consent.fiduciary_id)
 
-    # Renew the consent
-    consent = renew_consent_service(db, consent, purpose)
+    # Renew the consent. Reactivating an expired consent fails if a newer
+    # grant for the same purpose is already active.
+    try:
+        consent = renew_consent_service(db, consent, purpose)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Consent already granted for this purpose"
+        )
 
     # Generate new receipt
     receipt = generate_consent_receipt(db, consent, current_user, purpose, fiduciary)
@@ -432,7 +431,7 @@ def renew_consent(
             "purpose": purpose.name,
             "new_expires_at": consent.expires_at.isoformat()
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=request.state.client_ip,
         user_agent=request.headers.get("user-agent")
     )
 
@@ -444,7 +443,7 @@ def renew_consent(
         fiduciary_name=fiduciary.name,
         purpose_name=purpose.name,
         purpose_description=purpose.description,
-        data_categories=json.loads(purpose.data_categories),
+        data_categories=purpose.data_categories,
         legal_basis=purpose.legal_basis,
         retention_period_days=purpose.retention_period_days,
         granted_at=consent.granted_at,
@@ -472,7 +471,7 @@ def export_data_json(
         db, AuditAction.DATA_ACCESSED, "export", current_user.uuid,
         user_id=current_user.id,
         details={"format": "json", "consents_count": len(data["consents"])},
-        ip_address=request.client.host if request.client else None,
+        ip_address=request.state.client_ip,
         user_agent=request.headers.get("user-agent")
     )
 
@@ -503,7 +502,7 @@ def export_data_csv(
         db, AuditAction.DATA_ACCESSED, "export", current_user.uuid,
         user_id=current_user.id,
         details={"format": "csv", "consents_count": len(data["consents"])},
-        ip_address=request.client.host if request.client else None,
+        ip_address=request.state.client_ip,
         user_agent=request.headers.get("user-agent")
     )
 
@@ -4,6 +4,7 @@ User dashboard and health check endpoints
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -11,6 +12,7 @@ from app.models import (
     User, DataFiduciary, Purpose, Consent, AuditLog, ConsentStatus
 )
 from app.schemas import DashboardStats, DataFiduciaryResponse
+from app.services.cache import get_fiduciary_by_uuid
 from app.dependencies.auth import get_current_user
 from app.config import settings
 
@@ -23,19 +25,20 @@ def get_dashboard_stats(
     db: Session = Depends(get_db)
 ):
     """Get dashboard statistics"""
-    total_consents = db.query(Consent).filter(
+    # All counts in one round trip: conditional aggregation over the user's
+    # consents (as in fiduciary._get_consent_counts) plus the purpose count
+    # as a scalar subquery
+    active_purposes = select(func.count(Purpose.id)).where(
+        Purpose.is_active == True
+    ).scalar_subquery()
+    counts = db.query(
+        func.count(Consent.id).label('total'),
+        func.sum(case((Consent.status == ConsentStatus.GRANTED, 1), else_=0)).label('active'),
+        func.sum(case((Consent.status == ConsentStatus.REVOKED, 1), else_=0)).label('revoked'),
+        active_purposes.label('purposes')
+    ).filter(
         Consent.user_id == current_user.id
-    ).count()
-
-    active_consents = db.query(Consent).filter(
-        Consent.user_id == current_user.id,
-        Consent.status == ConsentStatus.GRANTED
-    ).count()
-
-    revoked_consents = db.query(Consent).filter(
-        Consent.user_id == current_user.id,
-        Consent.status == ConsentStatus.REVOKED
-    ).count()
+    ).first()
 
     # Recent activity
     recent = db.query(AuditLog).filter(
@@ -50,10 +53,10 @@ def get_dashboard_stats(
 
     return DashboardStats(
         total_users=1,
-        total_consents=total_consents,
-        active_consents=active_consents,
-        revoked_consents=revoked_consents,
-        total_purposes=db.query(Purpose).filter(Purpose.is_active == True).count(),
+        total_consents=counts.total or 0,
+        active_consents=int(counts.active or 0),
+        revoked_consents=int(counts.revoked or 0),
+        total_purposes=counts.purposes or 0,
         recent_activity=recent_activity
     )
 
@@ -69,7 +72,7 @@ def list_fiduciaries(db: Session = Depends(get_db)):
 @router.get("/api/fiduciaries/{uuid}", response_model=DataFiduciaryResponse)
 def get_fiduciary(uuid: str, db: Session = Depends(get_db)):
     """Get fiduciary details by UUID"""
-    fiduciary = db.query(DataFiduciary).filter(DataFiduciary.uuid == uuid).first()
+    fiduciary = get_fiduciary_by_uuid(db, uuid)
     if not fiduciary:
         raise HTTPException(status_code=404, detail="Fiduciary not found")
     return fiduciary
@@ -78,7 +81,7 @@ def get_fiduciary(uuid: str, db: Session = Depends(get_db)):
 # ========== Health Check ==========
 
 @router.get("/api/health")
-def health_check():
+async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
@@ -88,7 +91,7 @@ def health_check():
 
 
 @router.get("/")
-def root():
+async def root():
     """Root endpoint"""
     return {
         "name": f"{settings.APP_NAME} - Consent Management System",
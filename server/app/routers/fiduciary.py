@@ -10,16 +10,14 @@ This module provides endpoints for:
 
 All operations require fiduciary authentication.
 """
-import json
 from datetime import datetime, timedelta
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session, joinedload
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.database import get_db, safe_commit
+from app.rate_limit import limiter
 from app.constants import (
     DEFAULT_PAGE_LIMIT, DEFAULT_PAGE_OFFSET,
     DASHBOARD_RECENT_LIMIT, ErrorMessages
@@ -31,16 +29,14 @@ from app.models import (
 from app.schemas import (
     FiduciaryDashboardStats, PurposeCreate, PurposeResponse, AuditLogResponse
 )
-from app.services.auth import generate_api_key
+from app.services.auth import issue_api_key
 from app.services.audit import create_audit_log
+from app.services.cache import invalidate_cached_purpose
 from app.services.expiry import EXPIRING_SOON_DAYS
-from app.dependencies.auth import get_current_fiduciary
+from app.dependencies.auth import get_current_fiduciary, invalidate_fiduciary
 
 router = APIRouter(prefix="/api/fiduciary", tags=["Fiduciary Dashboard"])
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 
 # =============================================================================
 # HELPER FUNCTIONS
@@ -268,14 +264,13 @@ def create_fiduciary_purpose(
         fiduciary_id=current_fiduciary.id,
         name=data.name,
         description=data.description,
-        data_categories=json.dumps(data.data_categories),
+        data_categories=data.data_categories,
         retention_period_days=data.retention_period_days,
         legal_basis=data.legal_basis,
         is_mandatory=data.is_mandatory
     )
     db.add(purpose)
     safe_commit(db, "create purpose")
-    db.refresh(purpose)
 
     create_audit_log(
         db, AuditAction.PURPOSE_CREATED, "purpose", purpose.uuid,
@@ -322,13 +317,13 @@ def update_fiduciary_purpose(
 
     purpose.name = data.name
     purpose.description = data.description
-    purpose.data_categories = json.dumps(data.data_categories)
+    purpose.data_categories = data.data_categories
     purpose.retention_period_days = data.retention_period_days
     purpose.legal_basis = data.legal_basis
     purpose.is_mandatory = data.is_mandatory
 
     safe_commit(db, "update purpose")
-    db.refresh(purpose)
+    invalidate_cached_purpose(purpose.id)
     return purpose
 
 
@@ -367,6 +362,7 @@ def delete_fiduciary_purpose(
 
     purpose.is_active = False
     safe_commit(db, "deactivate purpose")
+    invalidate_cached_purpose(purpose.id)
     return {"message": "Purpose deactivated successfully"}
 
 
@@ -378,7 +374,7 @@ def delete_fiduciary_purpose(
 @limiter.limit("60/minute")
 def get_fiduciary_consents(
     request: Request,
-    status: Optional[str] = None,
+    status: Optional[ConsentStatus] = None,
     purpose_uuid: Optional[str] = None,
     limit: int = DEFAULT_PAGE_LIMIT,
     offset: int = DEFAULT_PAGE_OFFSET,
@@ -409,7 +405,7 @@ def get_fiduciary_consents(
 
     # Apply filters
     if status:
-        query = query.filter(Consent.status == ConsentStatus(status))
+        query = query.filter(Consent.status == status)
 
     if purpose_uuid:
         purpose = db.query(Purpose).filter(Purpose.uuid == purpose_uuid).first()
@@ -468,8 +464,9 @@ def regenerate_fiduciary_api_key(
     Returns:
         The new API key (only shown once).
     """
-    current_fiduciary.api_key = generate_api_key()
+    api_key = issue_api_key(current_fiduciary)
     safe_commit(db, "regenerate API key")
+    invalidate_fiduciary(current_fiduciary.id)
 
     create_audit_log(
         db, AuditAction.DATA_ACCESSED, "api_key", current_fiduciary.uuid,
@@ -477,7 +474,7 @@ def regenerate_fiduciary_api_key(
         details={"action": "regenerated"}
     )
 
-    return {"api_key": current_fiduciary.api_key}
+    return {"api_key": api_key}
 
 
 # =============================================================================
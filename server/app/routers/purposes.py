@@ -10,7 +10,6 @@ This module provides:
 Purposes define the legal basis and scope for data processing
 as required by DPDP Act and GDPR.
 """
-import json
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -21,6 +20,7 @@ from app.constants import ErrorMessages
 from app.models import DataFiduciary, Purpose, AuditAction
 from app.schemas import PurposeCreate, PurposeResponse
 from app.services.audit import create_audit_log
+from app.services.cache import get_purpose_by_uuid
 from app.dependencies.auth import get_fiduciary_by_api_key
 
 router = APIRouter(prefix="/api/purposes", tags=["Purposes"])
@@ -52,14 +52,13 @@ def create_purpose(
         fiduciary_id=fiduciary.id,
         name=data.name,
         description=data.description,
-        data_categories=json.dumps(data.data_categories),
+        data_categories=data.data_categories,
         retention_period_days=data.retention_period_days,
         legal_basis=data.legal_basis,
         is_mandatory=data.is_mandatory
     )
     db.add(purpose)
     safe_commit(db, "create purpose")
-    db.refresh(purpose)
 
     create_audit_log(
         db, AuditAction.PURPOSE_CREATED, "purpose", purpose.uuid,
@@ -117,7 +116,7 @@ def get_purpose(uuid: str, db: Session = Depends(get_db)):
     Raises:
         HTTPException 404: If purpose not found.
     """
-    purpose = db.query(Purpose).filter(Purpose.uuid == uuid).first()
+    purpose = get_purpose_by_uuid(db, uuid)
     if not purpose:
         raise HTTPException(status_code=404, detail=ErrorMessages.PURPOSE_NOT_FOUND)
     return purpose
@@ -2,23 +2,20 @@
 SDK Integration Router
 Endpoints for SDK consent verification
 """
-import json
 from typing import Optional
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 
 from app.database import get_db
+from app.rate_limit import limiter
 from app.models import DataFiduciary, User, Purpose, Consent, ConsentStatus
 from app.schemas import SDKConsentStatusRequest
+from app.schemas.auth import normalize_email
 from app.dependencies.auth import get_fiduciary_by_api_key
 
 router = APIRouter(prefix="/api/sdk", tags=["SDK Integration"])
 
-# Rate limiter - prevent user enumeration and abuse
-limiter = Limiter(key_func=get_remote_address)
-
 
 @router.post("/check-consent")
 @limiter.limit("100/minute")
@@ -29,7 +26,9 @@ def sdk_check_consent(
     db: Session = Depends(get_db)
 ):
     """Check consent status for a user (SDK endpoint)"""
-    user = db.query(User).filter(User.email == data.user_email).first()
+    user = db.query(User).filter(
+        func.lower(User.email) == normalize_email(data.user_email)
+    ).first()
     if not user:
         return {"has_consent": False, "consents": []}
 
@@ -46,11 +45,11 @@ def sdk_check_consent(
         if purpose:
             query = query.filter(Consent.purpose_id == purpose.id)
 
-    consents = query.all()
+    consents = query.options(joinedload(Consent.purpose)).all()
 
     result = []
     for c in consents:
-        purpose = db.query(Purpose).filter(Purpose.id == c.purpose_id).first()
+        purpose = c.purpose
         result.append({
             "consent_uuid": c.uuid,
             "purpose_uuid": purpose.uuid,
@@ -82,7 +81,7 @@ def sdk_get_purposes(
         "uuid": p.uuid,
         "name": p.name,
         "description": p.description,
-        "data_categories": json.loads(p.data_categories),
+        "data_categories": p.data_categories,
         "legal_basis": p.legal_basis,
         "is_mandatory": p.is_mandatory
     } for p in purposes]
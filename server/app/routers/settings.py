@@ -4,10 +4,9 @@ Profile updates and account management endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.database import get_db
+from app.rate_limit import limiter
 from app.models import (
     User, DataFiduciary, Consent, ConsentReceipt, AuditLog,
     Purpose, AuditAction
@@ -19,14 +18,15 @@ from app.schemas import (
     AccountDeleteRequest, AccountDeleteResponse,
     UserResponse, DataFiduciaryResponse
 )
-from app.services.auth import verify_password, get_password_hash
+from app.services.auth import verify_password, get_password_hash, UNUSABLE_PASSWORD
 from app.services.audit import create_audit_log
-from app.dependencies.auth import get_current_user, get_current_fiduciary
+from app.services.cache import invalidate_cached_fiduciary
+from app.dependencies.auth import (
+    get_current_user, get_current_fiduciary, invalidate_user, invalidate_fiduciary
+)
 
 router = APIRouter(prefix="/api/settings", tags=["Settings"])
 
-limiter = Limiter(key_func=get_remote_address)
-
 
 # ========== User Settings ==========
 
@@ -55,13 +55,13 @@ def update_user_profile(
         current_user.phone = data.phone
 
     db.commit()
-    db.refresh(current_user)
+    invalidate_user(current_user.id)
 
     create_audit_log(
         db, AuditAction.DATA_ACCESSED, "user_profile", current_user.uuid,
         user_id=current_user.id,
         details={"action": "profile_updated"},
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     return current_user
@@ -76,6 +76,9 @@ def change_user_password(
     db: Session = Depends(get_db)
 ):
     """Change user password (requires current password)"""
+    # Hand the principal lookup's connection back before bcrypt runs
+    db.commit()
+
     # Verify current password
     if not verify_password(data.current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
@@ -87,12 +90,13 @@ def change_user_password(
     # Update password
     current_user.hashed_password = get_password_hash(data.new_password)
     db.commit()
+    invalidate_user(current_user.id)
 
     create_audit_log(
         db, AuditAction.DATA_ACCESSED, "user_password", current_user.uuid,
         user_id=current_user.id,
         details={"action": "password_changed"},
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     return {"message": "Password changed successfully"}
@@ -111,6 +115,9 @@ def delete_user_account(
     Requires password confirmation and 'DELETE' confirmation text.
     This action is irreversible.
     """
+    # Hand the principal lookup's connection back before bcrypt runs
+    db.commit()
+
     # Verify password
     if not verify_password(data.password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Password is incorrect")
@@ -140,7 +147,7 @@ def delete_user_account(
             "email": current_user.email,
             "consents_deleted": consents_count
         },
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     # Delete consent receipts first (foreign key)
@@ -162,8 +169,10 @@ def delete_user_account(
     )
 
     # Delete user
+    user_id = current_user.id
     db.delete(current_user)
     db.commit()
+    invalidate_user(user_id)
 
     return AccountDeleteResponse(
         message="Account deleted successfully",
@@ -201,13 +210,14 @@ def update_fiduciary_profile(
         current_fiduciary.privacy_policy_url = data.privacy_policy_url
 
     db.commit()
-    db.refresh(current_fiduciary)
+    invalidate_fiduciary(current_fiduciary.id)
+    invalidate_cached_fiduciary(current_fiduciary.id)
 
     create_audit_log(
         db, AuditAction.DATA_ACCESSED, "fiduciary_profile", current_fiduciary.uuid,
         fiduciary_id=current_fiduciary.id,
         details={"action": "profile_updated"},
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     return current_fiduciary
@@ -222,8 +232,11 @@ def change_fiduciary_password(
     db: Session = Depends(get_db)
 ):
     """Change fiduciary password (requires current password)"""
+    # Hand the principal lookup's connection back before bcrypt runs
+    db.commit()
+
     # Verify current password
-    if not current_fiduciary.hashed_password:
+    if current_fiduciary.hashed_password == UNUSABLE_PASSWORD:
         raise HTTPException(status_code=400, detail="Password not set for this account")
 
     if not verify_password(data.current_password, current_fiduciary.hashed_password):
@@ -236,12 +249,13 @@ def change_fiduciary_password(
     # Update password
     current_fiduciary.hashed_password = get_password_hash(data.new_password)
     db.commit()
+    invalidate_fiduciary(current_fiduciary.id)
 
     create_audit_log(
         db, AuditAction.DATA_ACCESSED, "fiduciary_password", current_fiduciary.uuid,
         fiduciary_id=current_fiduciary.id,
         details={"action": "password_changed"},
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     return {"message": "Password changed successfully"}
@@ -261,8 +275,11 @@ def delete_fiduciary_account(
     This will also delete all purposes, webhooks, and revoke all user consents.
     This action is irreversible.
     """
+    # Hand the principal lookup's connection back before bcrypt runs
+    db.commit()
+
     # Verify password
-    if not current_fiduciary.hashed_password:
+    if current_fiduciary.hashed_password == UNUSABLE_PASSWORD:
         raise HTTPException(status_code=400, detail="Password not set for this account")
 
     if not verify_password(data.password, current_fiduciary.hashed_password):
@@ -293,7 +310,7 @@ def delete_fiduciary_account(
             "name": current_fiduciary.name,
             "consents_affected": consents_count
         },
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     # Delete webhook deliveries first
@@ -338,8 +355,11 @@ def delete_fiduciary_account(
     )
 
     # Delete fiduciary
+    fiduciary_id = current_fiduciary.id
     db.delete(current_fiduciary)
     db.commit()
+    invalidate_fiduciary(fiduciary_id)
+    invalidate_cached_fiduciary(fiduciary_id)
 
     return AccountDeleteResponse(
         message="Account deleted successfully",
@@ -2,14 +2,12 @@
 Webhooks Router
 Webhook management endpoints for fiduciaries
 """
-import json
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.database import get_db
+from app.rate_limit import limiter
 from app.models import DataFiduciary, Webhook, AuditAction
 from app.schemas import (
     WebhookCreate,
@@ -34,8 +32,6 @@ from app.dependencies.auth import get_current_fiduciary
 
 router = APIRouter(prefix="/api/webhooks", tags=["Webhooks"])
 
-limiter = Limiter(key_func=get_remote_address)
-
 
 def webhook_to_response(webhook: Webhook) -> WebhookResponse:
     """Convert webhook model to response schema"""
@@ -44,7 +40,8 @@ def webhook_to_response(webhook: Webhook) -> WebhookResponse:
         uuid=webhook.uuid,
         name=webhook.name,
         url=webhook.url,
-        events=json.loads(webhook.events),
+        events=webhook.events,
+        batch_events=webhook.batch_events,
         is_active=webhook.is_active,
         created_at=webhook.created_at,
         updated_at=webhook.updated_at
@@ -73,14 +70,15 @@ def create_new_webhook(
         fiduciary_id=current_fiduciary.id,
         name=data.name,
         url=str(data.url),
-        events=data.events
+        events=data.events,
+        batch_events=data.batch_events
     )
 
     create_audit_log(
         db, AuditAction.DATA_ACCESSED, "webhook", webhook.uuid,
         fiduciary_id=current_fiduciary.id,
         details={"action": "created", "name": webhook.name},
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     return WebhookWithSecret(
@@ -88,7 +86,8 @@ def create_new_webhook(
         uuid=webhook.uuid,
         name=webhook.name,
         url=webhook.url,
-        events=json.loads(webhook.events),
+        events=webhook.events,
+        batch_events=webhook.batch_events,
         is_active=webhook.is_active,
         created_at=webhook.created_at,
         updated_at=webhook.updated_at,
@@ -141,6 +140,7 @@ def update_existing_webhook(
         name=data.name,
         url=str(data.url) if data.url else None,
         events=data.events,
+        batch_events=data.batch_events,
         is_active=data.is_active
     )
 
@@ -148,7 +148,7 @@ def update_existing_webhook(
         db, AuditAction.DATA_ACCESSED, "webhook", webhook.uuid,
         fiduciary_id=current_fiduciary.id,
         details={"action": "updated"},
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     return webhook_to_response(updated)
@@ -173,7 +173,7 @@ def delete_existing_webhook(
         db, AuditAction.DATA_ACCESSED, "webhook", webhook_uuid,
         fiduciary_id=current_fiduciary.id,
         details={"action": "deleted", "name": webhook_name},
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     return {"message": "Webhook deleted successfully"}
@@ -197,7 +197,7 @@ def regenerate_secret(
         db, AuditAction.DATA_ACCESSED, "webhook", webhook.uuid,
         fiduciary_id=current_fiduciary.id,
         details={"action": "secret_regenerated"},
-        ip_address=request.client.host if request.client else None
+        ip_address=request.state.client_ip
     )
 
     return {"secret": new_secret}
@@ -1,7 +1,8 @@
 """
 Audit Log Schemas
 """
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum
@@ -27,13 +28,21 @@ class AuditLogResponse(BaseModel):
     action: str
     resource_type: str
     resource_id: Optional[str]
-    details: Optional[str]
+    details: Optional[str]  # JSON string
     ip_address: Optional[str]
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+    @field_validator('details', mode='before')
+    @classmethod
+    def serialize_details(cls, v):
+        # Stored as JSONB; clients still receive the JSON text
+        if v is None or isinstance(v, str):
+            return v
+        return orjson.dumps(v).decode()
+
 
 class AuditLogFilter(BaseModel):
     """Schema for filtering audit logs"""
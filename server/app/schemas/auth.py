@@ -1,7 +1,18 @@
 """
 Auth Schemas - Email verification and password reset
 """
-from pydantic import BaseModel, EmailStr, Field
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, EmailStr, Field
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form emails are stored and looked up in"""
+    return email.strip().lower()
+
+
+# Accepted in any case, handled lower-case; matches the lower(email) indexes
+NormalizedEmail = Annotated[EmailStr, AfterValidator(normalize_email)]
 
 
 class VerifyEmailRequest(BaseModel):
@@ -11,12 +22,12 @@ class VerifyEmailRequest(BaseModel):
 
 class ResendVerificationRequest(BaseModel):
     """Schema for resending verification email"""
-    email: EmailStr
+    email: NormalizedEmail
 
 
 class ForgotPasswordRequest(BaseModel):
     """Schema for requesting password reset"""
-    email: EmailStr
+    email: NormalizedEmail
 
 
 class ResetPasswordRequest(BaseModel):
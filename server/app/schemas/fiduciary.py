@@ -1,17 +1,19 @@
 """
 Data Fiduciary Schemas
 """
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
 
+from app.schemas.auth import NormalizedEmail
+
 
 class DataFiduciaryCreate(BaseModel):
     """Schema for creating a data fiduciary (API key only)"""
     name: str = Field(..., min_length=2, max_length=255)
     description: Optional[str] = None
     privacy_policy_url: Optional[str] = None
-    contact_email: EmailStr
+    contact_email: NormalizedEmail
 
 
 class FiduciaryRegister(BaseModel):
@@ -19,7 +21,7 @@ class FiduciaryRegister(BaseModel):
     name: str = Field(..., min_length=2, max_length=255)
     description: Optional[str] = None
     privacy_policy_url: Optional[str] = None
-    contact_email: EmailStr
+    contact_email: NormalizedEmail
     password: str = Field(..., min_length=8)
 
 
@@ -1,7 +1,8 @@
 """
 Purpose Schemas
 """
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import List
 
@@ -32,3 +33,11 @@ class PurposeResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @field_validator('data_categories', mode='before')
+    @classmethod
+    def serialize_data_categories(cls, v):
+        # Stored as JSONB; clients still receive the JSON text
+        if isinstance(v, str):
+            return v
+        return orjson.dumps(v).decode()
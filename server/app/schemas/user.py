@@ -1,14 +1,16 @@
 """
 User Schemas
 """
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
+from app.schemas.auth import NormalizedEmail
+
 
 class UserCreate(BaseModel):
     """Schema for user registration"""
-    email: EmailStr
+    email: NormalizedEmail
     name: str = Field(..., min_length=2, max_length=255)
     phone: Optional[str] = None
     password: str = Field(..., min_length=8)
@@ -16,7 +18,7 @@ class UserCreate(BaseModel):
 
 class UserLogin(BaseModel):
     """Schema for user login"""
-    email: EmailStr
+    email: NormalizedEmail
     password: str
 
 
@@ -58,6 +58,7 @@ class WebhookCreate(BaseModel):
     name: str
     url: HttpUrl
     events: List[str]
+    batch_events: bool = False
 
     @field_validator('url')
     @classmethod
@@ -91,6 +92,7 @@ class WebhookUpdate(BaseModel):
     name: Optional[str] = None
     url: Optional[HttpUrl] = None
     events: Optional[List[str]] = None
+    batch_events: Optional[bool] = None
     is_active: Optional[bool] = None
 
     @field_validator('url')
@@ -122,6 +124,7 @@ class WebhookResponse(BaseModel):
     name: str
     url: str
     events: List[str]
+    batch_events: bool = False
     is_active: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -16,13 +16,20 @@ All logs are append-only and include:
 - Resource affected
 - IP address and user agent for traceability
 """
-import json
+import asyncio
+import logging
+from datetime import date, datetime, timezone
 from typing import Optional, Dict, Any
 
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.constants import AUDIT_PARTITION_MONTHS_AHEAD, AUDIT_PARTITION_CHECK_SECONDS
 from app.models import AuditLog, AuditAction
-from app.database import safe_commit
+from app.database import engine, safe_commit
+
+logger = logging.getLogger(__name__)
 
 
 def create_audit_log(
@@ -34,7 +41,8 @@ def create_audit_log(
     fiduciary_id: Optional[int] = None,
     details: Optional[Dict[str, Any]] = None,
     ip_address: Optional[str] = None,
-    user_agent: Optional[str] = None
+    user_agent: Optional[str] = None,
+    commit: bool = True
 ) -> AuditLog:
     """
     Create an immutable audit log entry.
@@ -49,9 +57,12 @@ def create_audit_log(
         resource_id: Optional UUID of the affected resource.
         user_id: Optional ID of the user who performed the action.
         fiduciary_id: Optional ID of the fiduciary who performed the action.
-        details: Optional dictionary of additional context (will be JSON serialized).
+        details: Optional dictionary of additional context (stored as JSONB).
         ip_address: Optional client IP address for traceability.
         user_agent: Optional client user agent string.
+        commit: Commit immediately (default). Pass False to add the entry to
+            the caller's transaction so it is persisted atomically with the
+            change it records, in the caller's single commit.
 
     Returns:
         The created AuditLog entry.
@@ -78,12 +89,13 @@ def create_audit_log(
         action=action,
         resource_type=resource_type,
         resource_id=resource_id,
-        details=json.dumps(details) if details else None,
+        details=details or None,
         ip_address=ip_address,
         user_agent=user_agent
     )
     db.add(log)
-    safe_commit(db, "create audit log")
+    if commit:
+        safe_commit(db, "create audit log")
 
     return log
 
@@ -142,3 +154,50 @@ def get_fiduciary_audit_trail(
     ).order_by(
         AuditLog.created_at.desc()
     ).offset(offset).limit(limit).all()
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def ensure_audit_partitions(months_ahead: int = AUDIT_PARTITION_MONTHS_AHEAD) -> None:
+    """
+    Create the monthly audit_logs partitions for the current month and the
+    next few, so inserts land in their month instead of the default
+    partition.
+
+    Retention is handled by dropping whole months, e.g.
+    DROP TABLE audit_logs_2024_01, without a DELETE + VACUUM pass.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    month = datetime.now(timezone.utc).date().replace(day=1)
+    for _ in range(months_ahead + 1):
+        upper = _next_month(month)
+        try:
+            # One transaction per partition: a month whose rows already sit
+            # in the default partition fails on its own without blocking
+            # the others.
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS audit_logs_{month:%Y_%m} "
+                    f"PARTITION OF audit_logs "
+                    f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+                ))
+        except SQLAlchemyError as e:
+            logger.warning("Could not create audit partition for %s: %s", month, e)
+        month = upper
+
+
+async def run_audit_partition_worker() -> None:
+    """
+    Background loop keeping upcoming audit_logs partitions in place.
+    Started on application startup; the DDL runs in a thread.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(ensure_audit_partitions)
+        except Exception:
+            logger.exception("Audit partition maintenance failed")
+        await asyncio.sleep(AUDIT_PARTITION_CHECK_SECONDS)
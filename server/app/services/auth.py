@@ -3,12 +3,35 @@ Authentication Service
 Password hashing, JWT handling, and API key generation
 """
 import bcrypt
+import hashlib
+import jwt
+import logging
+import os
 import secrets
+import threading
+import time
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
+
+from jwt.algorithms import get_default_algorithms
 
 from app.config import settings
+from app.constants import API_KEY_PREFIX_LENGTH, API_KEY_SUFFIX_LENGTH
+
+logger = logging.getLogger(__name__)
+
+# Hashes faster than this are too cheap to brute-force resist
+_MIN_HASH_SECONDS = 0.2
+
+# bcrypt releases the GIL, so concurrent hashes from the request threadpool
+# all compete for CPU. Capping them at one per core keeps each hash at its
+# normal latency and stops a burst of logins from starving other work.
+_HASH_SLOTS = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+# Stored for accounts that never set a password (e.g. API-key-only
+# fiduciaries); not a bcrypt hash, so no password ever verifies against it
+UNUSABLE_PASSWORD = "!"
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,7 +40,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Truncates to 72 bytes for bcrypt compatibility.
     """
     password_bytes = plain_password.encode('utf-8')[:72]
-    return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+    with _HASH_SLOTS:
+        try:
+            return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+        except ValueError:
+            # Malformed or unusable stored hash
+            return False
 
 
 def get_password_hash(password: str) -> str:
@@ -26,8 +54,45 @@ def get_password_hash(password: str) -> str:
     Truncates to 72 bytes for bcrypt compatibility.
     """
     password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+    salt = bcrypt.gensalt(settings.BCRYPT_ROUNDS)
+    with _HASH_SLOTS:
+        return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a bcrypt hash was made with a different work factor than
+    BCRYPT_ROUNDS. Hashes look like $2b$12$<salt+digest>.
+    """
+    try:
+        return int(hashed_password.split('$')[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+def check_password_hash_cost() -> None:
+    """
+    Time one hash at the configured cost and warn if it is too fast.
+    Called once on startup.
+    """
+    start = time.perf_counter()
+    get_password_hash("benchmark-password")
+    elapsed = time.perf_counter() - start
+    if elapsed < _MIN_HASH_SECONDS:
+        logger.warning(
+            "bcrypt with %d rounds takes %.0fms; consider raising BCRYPT_ROUNDS",
+            settings.BCRYPT_ROUNDS, elapsed * 1000
+        )
+
+
+@lru_cache(maxsize=1)
+def _signing_key() -> Any:
+    """
+    SECRET_KEY prepared once for the configured algorithm.
+    PyJWT otherwise re-encodes (or, for RS*/ES*, re-parses the PEM) per token.
+    """
+    algorithm = get_default_algorithms()[settings.ALGORITHM]
+    return algorithm.prepare_key(settings.SECRET_KEY)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -40,7 +105,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, _signing_key(), algorithm=settings.ALGORITHM)
 
 
 def decode_token(token: str) -> Optional[dict]:
@@ -51,7 +116,7 @@ def decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
 
 
@@ -61,3 +126,45 @@ def generate_api_key() -> str:
     64 character hex string (256 bits of entropy).
     """
     return secrets.token_hex(32)
+
+
+def hash_token(token: str) -> str:
+    """
+    Hash a high-entropy secret (API key, emailed token) for storage and
+    lookup. The secrets are random, so an unsalted SHA-256 is enough to
+    make the stored value useless to anyone reading the database, and the
+    fixed-width digest makes a compact index key.
+    """
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def hash_api_key(api_key: str) -> str:
+    """Hash an API key for storage and lookup"""
+    return hash_token(api_key)
+
+
+def api_key_columns(api_key: str) -> dict:
+    """
+    Column values stored for an API key: its hash plus the prefix, suffix
+    and masked hint shown on the dashboard, computed once per key.
+    """
+    prefix = api_key[:API_KEY_PREFIX_LENGTH]
+    suffix = api_key[-API_KEY_SUFFIX_LENGTH:]
+    return {
+        "api_key_hash": hash_api_key(api_key),
+        "api_key_prefix": prefix,
+        "api_key_suffix": suffix,
+        "api_key_hint": f"{prefix}****{suffix}",
+    }
+
+
+def issue_api_key(fiduciary) -> str:
+    """
+    Generate a new API key for a fiduciary.
+    Stores only its hash plus the prefix/suffix used for the masked hint,
+    and returns the plaintext key (shown to the fiduciary once).
+    """
+    api_key = generate_api_key()
+    for column, value in api_key_columns(api_key).items():
+        setattr(fiduciary, column, value)
+    return api_key
@@ -0,0 +1,129 @@
+"""
+Catalog Cache
+Process-local TTL cache of purposes and fiduciaries.
+
+Both are read on nearly every consent request (grant, revoke, renew,
+receipts, public lookups) but change rarely. Cached values are immutable
+column snapshots (SQLAlchemy Rows with the model's attribute names), so
+they can be shared between requests and never hold a session.
+
+Entries are dropped by the endpoints that modify them; the TTL bounds
+staleness across worker processes.
+"""
+import threading
+from typing import Optional
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import DataFiduciary, Purpose
+
+_CATALOG_CACHE_SIZE = 10_000
+_CATALOG_CACHE_TTL = settings.CATALOG_CACHE_TTL_SECONDS
+
+_cache_lock = threading.Lock()
+# Keyed by ("id", id) and ("uuid", uuid); both keys hold the same snapshot
+_purpose_cache: TTLCache = TTLCache(maxsize=_CATALOG_CACHE_SIZE, ttl=_CATALOG_CACHE_TTL)
+_fiduciary_cache: TTLCache = TTLCache(maxsize=_CATALOG_CACHE_SIZE, ttl=_CATALOG_CACHE_TTL)
+
+_PURPOSE_COLUMNS = select(*Purpose.__table__.c)
+# Public profile columns only; password and API key hashes are never cached
+_FIDUCIARY_COLUMNS = select(
+    DataFiduciary.id, DataFiduciary.uuid, DataFiduciary.name,
+    DataFiduciary.description, DataFiduciary.privacy_policy_url,
+    DataFiduciary.contact_email, DataFiduciary.is_active,
+    DataFiduciary.created_at
+)
+
+
+def _lookup(cache: TTLCache, db: Session, stmt, key: tuple) -> Optional[Row]:
+    with _cache_lock:
+        row = cache.get(key)
+    if row is not None:
+        return row
+
+    row = db.execute(stmt).first()
+    if row is not None:
+        with _cache_lock:
+            cache[("id", row.id)] = row
+            cache[("uuid", row.uuid)] = row
+    return row
+
+
+def _canonical_uuid(value) -> Optional[str]:
+    """Canonical dashed form of a UUID, or None if it is not one"""
+    try:
+        return str(UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def _drop(cache: TTLCache, key: tuple) -> Optional[Row]:
+    """Remove a snapshot under both of its keys"""
+    with _cache_lock:
+        row = cache.pop(key, None)
+        if row is not None:
+            cache.pop(("id", row.id), None)
+            cache.pop(("uuid", row.uuid), None)
+    return row
+
+
+def get_purpose(db: Session, purpose_id: int) -> Optional[Row]:
+    """Purpose snapshot by id, or None"""
+    return _lookup(
+        _purpose_cache, db,
+        _PURPOSE_COLUMNS.where(Purpose.id == purpose_id),
+        ("id", purpose_id)
+    )
+
+
+def get_purpose_by_uuid(db: Session, uuid: str) -> Optional[Row]:
+    """Purpose snapshot by UUID, or None"""
+    # Any spelling of the UUID shares one entry; malformed ones match nothing
+    uuid = _canonical_uuid(uuid)
+    if uuid is None:
+        return None
+    return _lookup(
+        _purpose_cache, db,
+        _PURPOSE_COLUMNS.where(Purpose.uuid == uuid),
+        ("uuid", uuid)
+    )
+
+
+def get_fiduciary(db: Session, fiduciary_id: int) -> Optional[Row]:
+    """Fiduciary public profile snapshot by id, or None"""
+    return _lookup(
+        _fiduciary_cache, db,
+        _FIDUCIARY_COLUMNS.where(DataFiduciary.id == fiduciary_id),
+        ("id", fiduciary_id)
+    )
+
+
+def get_fiduciary_by_uuid(db: Session, uuid: str) -> Optional[Row]:
+    """Fiduciary public profile snapshot by UUID, or None"""
+    # Any spelling of the UUID shares one entry; malformed ones match nothing
+    uuid = _canonical_uuid(uuid)
+    if uuid is None:
+        return None
+    return _lookup(
+        _fiduciary_cache, db,
+        _FIDUCIARY_COLUMNS.where(DataFiduciary.uuid == uuid),
+        ("uuid", uuid)
+    )
+
+
+def invalidate_cached_purpose(purpose_id: int) -> None:
+    """Drop a cached purpose. Call after updating or deactivating it."""
+    _drop(_purpose_cache, ("id", purpose_id))
+
+
+def invalidate_cached_fiduciary(fiduciary_id: int) -> None:
+    """Drop a cached fiduciary and all of its cached purposes"""
+    _drop(_fiduciary_cache, ("id", fiduciary_id))
+    with _cache_lock:
+        stale = [k for k, p in _purpose_cache.items() if p.fiduciary_id == fiduciary_id]
+        for key in stale:
+            _purpose_cache.pop(key, None)
@@ -5,7 +5,6 @@ Business logic for consent management and cryptographic receipt generation.
 This module handles:
 - Consent receipt generation with HMAC-SHA256 signatures
 - Signature verification for tamper detection
-- Consent existence checking
 
 All consent receipts are cryptographically signed to ensure:
 - Data integrity (tampering detection)
@@ -14,7 +13,6 @@ All consent receipts are cryptographically signed to ensure:
 """
 import json
 import hmac
-import hashlib
 from typing import Dict, Any
 
 from sqlalchemy.orm import Session
@@ -53,7 +51,9 @@ def generate_consent_signature(data: Dict[str, Any], fiduciary_id: int) -> str:
     # Serialize data deterministically (sorted keys)
     message = json.dumps(data, sort_keys=True).encode()
 
-    return hmac.new(signing_key, message, hashlib.sha256).hexdigest()
+    # One-shot HMAC: runs entirely in OpenSSL (SHA-NI / ARMv8 SHA2 where
+    # the CPU has them) without building an hmac.HMAC object
+    return hmac.digest(signing_key, message, "sha256").hex()
 
 
 def verify_consent_signature(
@@ -91,7 +91,8 @@ def generate_consent_receipt(
     consent: Consent,
     user: User,
     purpose: Purpose,
-    fiduciary: DataFiduciary
+    fiduciary: DataFiduciary,
+    commit: bool = True
 ) -> ConsentReceipt:
     """
     Generate a consent receipt with HMAC-SHA256 signature.
@@ -110,6 +111,8 @@ def generate_consent_receipt(
         user: The data principal who granted consent.
         purpose: The purpose the consent was granted for.
         fiduciary: The data fiduciary receiving consent.
+        commit: Commit immediately (default). Pass False to persist the
+            receipt in the caller's transaction, e.g. with the consent.
 
     Returns:
         The created ConsentReceipt with signature.
@@ -131,7 +134,7 @@ def generate_consent_receipt(
         "purpose": {
             "name": purpose.name,
             "description": purpose.description,
-            "data_categories": json.loads(purpose.data_categories),
+            "data_categories": purpose.data_categories,
             "legal_basis": purpose.legal_basis,
             "retention_days": purpose.retention_period_days
         },
@@ -146,36 +149,11 @@ def generate_consent_receipt(
     # Create and persist receipt
     receipt = ConsentReceipt(
         consent_id=consent.id,
-        receipt_data=json.dumps(receipt_data),
+        receipt_data=receipt_data,
         signature=signature
     )
     db.add(receipt)
-    safe_commit(db, "generate consent receipt")
-    db.refresh(receipt)
+    if commit:
+        safe_commit(db, "generate consent receipt")
 
     return receipt
-
-
-def check_consent_exists(db: Session, user_id: int, purpose_id: int) -> bool:
-    """
-    Check if an active consent exists for a user and purpose.
-
-    Used to prevent duplicate consent grants for the same purpose.
-
-    Args:
-        db: Database session.
-        user_id: ID of the user (data principal).
-        purpose_id: ID of the purpose.
-
-    Returns:
-        True if an active (GRANTED) consent exists, False otherwise.
-    """
-    from app.models.audit import ConsentStatus
-
-    existing = db.query(Consent).filter(
-        Consent.user_id == user_id,
-        Consent.purpose_id == purpose_id,
-        Consent.status == ConsentStatus.GRANTED
-    ).first()
-
-    return existing is not None
@@ -3,13 +3,16 @@ Email Service - Supports Resend API (recommended) with SMTP fallback
 Resend: Modern transactional email API (https://resend.com)
 SMTP: Legacy support for Gmail, AWS SES, SendGrid, etc.
 """
+import asyncio
 import aiosmtplib
 import httpx
+from typing import Optional, Tuple
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
 
 from app.config import settings
+from app.constants import EMAIL_SEND_ATTEMPTS, EMAIL_RETRY_BACKOFF_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +20,31 @@ RESEND_API_URL = "https://api.resend.com/emails"
 
 
 class EmailService:
-    """Email service with Resend API and SMTP fallback"""
+    """
+    Email service with Resend API and SMTP fallback.
+
+    Sends run as background tasks after the response. Resend requests share
+    one pooled HTTP client, and transient failures (network errors, 429,
+    5xx) are retried with exponential backoff.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        # Created on first use, inside the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                headers={"Authorization": f"Bearer {self.resend_api_key}"},
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @property
     def resend_api_key(self) -> str:
@@ -51,45 +78,53 @@ class EmailService:
             logger.warning(f"Email not configured. Would have sent to {to_email}: {subject}")
             return False
 
-        if self.use_resend:
-            return await self._send_via_resend(to_email, subject, html_content)
-        else:
-            return await self._send_via_smtp(to_email, subject, html_content)
-
-    async def _send_via_resend(self, to_email: str, subject: str, html_content: str) -> bool:
-        """Send email via Resend API"""
+        send = self._send_via_resend if self.use_resend else self._send_via_smtp
+        for attempt in range(1, EMAIL_SEND_ATTEMPTS + 1):
+            sent, retryable = await send(to_email, subject, html_content)
+            if sent or not retryable:
+                return sent
+            if attempt < EMAIL_SEND_ATTEMPTS:
+                await asyncio.sleep(EMAIL_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        logger.error(f"Giving up on email to {to_email} after {EMAIL_SEND_ATTEMPTS} attempts: {subject}")
+        return False
+
+    async def _send_via_resend(self, to_email: str, subject: str, html_content: str) -> Tuple[bool, bool]:
+        """
+        Send email via Resend API.
+        Returns (sent, retryable).
+        """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    RESEND_API_URL,
-                    headers={
-                        "Authorization": f"Bearer {self.resend_api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "from": f"{self.resend_from_name} <{self.resend_from_email}>",
-                        "to": [to_email],
-                        "subject": subject,
-                        "html": html_content,
-                        "text": self._html_to_plain(html_content),
-                    },
-                    timeout=30.0,
-                )
-
-                if response.status_code in (200, 201):
-                    data = response.json()
-                    logger.info(f"Email sent via Resend to {to_email}: {subject} (id: {data.get('id', 'unknown')})")
-                    return True
-                else:
-                    logger.error(f"Resend API error: {response.status_code} - {response.text}")
-                    return False
+            response = await self._http_client().post(
+                RESEND_API_URL,
+                json={
+                    "from": f"{self.resend_from_name} <{self.resend_from_email}>",
+                    "to": [to_email],
+                    "subject": subject,
+                    "html": html_content,
+                    "text": self._html_to_plain(html_content),
+                },
+            )
 
+            if response.status_code in (200, 201):
+                data = response.json()
+                logger.info(f"Email sent via Resend to {to_email}: {subject} (id: {data.get('id', 'unknown')})")
+                return True, False
+            else:
+                logger.error(f"Resend API error: {response.status_code} - {response.text}")
+                return False, response.status_code == 429 or response.status_code >= 500
+
+        except httpx.TransportError as e:
+            logger.warning(f"Transient error sending email via Resend to {to_email}: {str(e)}")
+            return False, True
         except Exception as e:
             logger.error(f"Failed to send email via Resend to {to_email}: {str(e)}")
-            return False
+            return False, False
 
-    async def _send_via_smtp(self, to_email: str, subject: str, html_content: str) -> bool:
-        """Send email via SMTP (fallback)"""
+    async def _send_via_smtp(self, to_email: str, subject: str, html_content: str) -> Tuple[bool, bool]:
+        """
+        Send email via SMTP (fallback).
+        Returns (sent, retryable).
+        """
         try:
             message = MIMEMultipart("alternative")
             message["Subject"] = subject
@@ -110,11 +145,15 @@ class EmailService:
             )
 
             logger.info(f"Email sent via SMTP to {to_email}: {subject}")
-            return True
+            return True, False
 
+        except (aiosmtplib.SMTPConnectError, aiosmtplib.SMTPServerDisconnected,
+                aiosmtplib.SMTPTimeoutError) as e:
+            logger.warning(f"Transient error sending email via SMTP to {to_email}: {str(e)}")
+            return False, True
         except Exception as e:
             logger.error(f"Failed to send email via SMTP to {to_email}: {str(e)}")
-            return False
+            return False, False
 
     def _html_to_plain(self, html: str) -> str:
         """Simple HTML to plain text conversion"""
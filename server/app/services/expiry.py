@@ -1,36 +1,23 @@
 """
 Consent Expiry Service - Handle consent expiration and renewal
 """
+import asyncio
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, joinedload
 
+from app.constants import CONSENT_EXPIRY_SWEEP_SECONDS
+from app.database import SessionLocal
 from app.models import Consent, ConsentStatus, Purpose
 
+logger = logging.getLogger(__name__)
+
 # Days before expiry to consider "expiring soon"
 EXPIRING_SOON_DAYS = 14
 
 
-def is_consent_expired(consent: Consent) -> bool:
-    """Check if a consent has expired"""
-    if consent.status == ConsentStatus.REVOKED:
-        return False
-    if consent.expires_at is None:
-        return False
-    return datetime.now(timezone.utc) > consent.expires_at
-
-
-def is_consent_expiring_soon(consent: Consent, days: int = EXPIRING_SOON_DAYS) -> bool:
-    """Check if a consent is expiring within X days"""
-    if consent.status != ConsentStatus.GRANTED:
-        return False
-    if consent.expires_at is None:
-        return False
-    now = datetime.now(timezone.utc)
-    expiry_threshold = now + timedelta(days=days)
-    return consent.expires_at <= expiry_threshold and consent.expires_at > now
-
-
 def get_days_until_expiry(consent: Consent) -> Optional[int]:
     """Get the number of days until consent expires"""
     if consent.expires_at is None:
@@ -39,55 +26,70 @@ def get_days_until_expiry(consent: Consent) -> Optional[int]:
     return max(0, delta.days)
 
 
-def check_and_update_expired_consent(db: Session, consent: Consent) -> bool:
+def expire_lapsed_consents(db: Session, user_id: Optional[int] = None) -> int:
     """
-    Check if consent has expired and update status if needed.
-    Returns True if consent was marked as expired.
-    """
-    if consent.status == ConsentStatus.GRANTED and is_consent_expired(consent):
-        consent.status = ConsentStatus.EXPIRED
-        db.commit()
-        return True
-    return False
-
+    Mark every GRANTED consent past its expiry as EXPIRED in one UPDATE.
+    Keeps status accurate without per-row checks, and keeps the partial
+    "active consent" indexes limited to live rows.
 
-def get_user_expiring_consents(
-    db: Session,
-    user_id: int,
-    days: int = EXPIRING_SOON_DAYS
-) -> List[Consent]:
-    """Get all consents expiring soon for a user"""
-    now = datetime.now(timezone.utc)
-    expiry_threshold = now + timedelta(days=days)
+    Args:
+        db: Database session.
+        user_id: Only expire this user's consents (e.g. before listing
+            them); all users if None.
 
-    return db.query(Consent).filter(
-        Consent.user_id == user_id,
+    Returns:
+        Number of consents expired.
+    """
+    stmt = update(Consent).where(
         Consent.status == ConsentStatus.GRANTED,
-        Consent.expires_at != None,
-        Consent.expires_at <= expiry_threshold,
-        Consent.expires_at > now
-    ).all()
+        Consent.expires_at < datetime.now(timezone.utc)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Consent.user_id == user_id)
+
+    result = db.execute(
+        stmt.values(status=ConsentStatus.EXPIRED)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
 
 
-def get_user_expired_consents(db: Session, user_id: int) -> List[Consent]:
-    """Get all expired consents for a user"""
-    return db.query(Consent).filter(
-        Consent.user_id == user_id,
-        Consent.status == ConsentStatus.EXPIRED
-    ).all()
+def _expire_lapsed_batch() -> int:
+    """Run one expiry sweep with its own session"""
+    with SessionLocal() as db:
+        return expire_lapsed_consents(db)
+
+
+async def run_consent_expiry_worker() -> None:
+    """
+    Background loop expiring lapsed consents.
+    Started on application startup; the UPDATE runs in a thread.
+    """
+    while True:
+        try:
+            expired = await asyncio.to_thread(_expire_lapsed_batch)
+            if expired:
+                logger.info("Expired %d lapsed consents", expired)
+        except Exception:
+            logger.exception("Consent expiry sweep failed")
+        await asyncio.sleep(CONSENT_EXPIRY_SWEEP_SECONDS)
 
 
-def get_fiduciary_expiring_consents(
+def get_user_expiring_consents(
     db: Session,
-    fiduciary_id: int,
+    user_id: int,
     days: int = EXPIRING_SOON_DAYS
 ) -> List[Consent]:
-    """Get all consents expiring soon for a fiduciary"""
+    """Get all consents expiring soon for a user, with purpose and fiduciary loaded"""
     now = datetime.now(timezone.utc)
     expiry_threshold = now + timedelta(days=days)
 
-    return db.query(Consent).filter(
-        Consent.fiduciary_id == fiduciary_id,
+    return db.query(Consent).options(
+        joinedload(Consent.purpose),
+        joinedload(Consent.fiduciary)
+    ).filter(
+        Consent.user_id == user_id,
         Consent.status == ConsentStatus.GRANTED,
         Consent.expires_at != None,
         Consent.expires_at <= expiry_threshold,
@@ -108,5 +110,4 @@ def renew_consent(db: Session, consent: Consent, purpose: Purpose) -> Consent:
     consent.expires_at = datetime.now(timezone.utc) + timedelta(days=purpose.retention_period_days)
 
     db.commit()
-    db.refresh(consent)
     return consent
@@ -7,9 +7,9 @@ import csv
 import io
 from datetime import datetime
 from typing import Dict, Any, List
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
-from app.models import User, Consent, ConsentReceipt, Purpose, DataFiduciary, AuditLog
+from app.models import User, Consent, AuditLog
 
 
 def get_user_export_data(db: Session, user: User) -> Dict[str, Any]:
@@ -28,16 +28,17 @@ def get_user_export_data(db: Session, user: User) -> Dict[str, Any]:
 
     # Consents
     consents_data = []
-    consents = db.query(Consent).filter(Consent.user_id == user.id).all()
+    # Load related rows with the consents (one query) instead of per consent
+    consents = db.query(Consent).options(
+        joinedload(Consent.purpose),
+        joinedload(Consent.fiduciary),
+        joinedload(Consent.receipt),
+    ).filter(Consent.user_id == user.id).all()
 
     for consent in consents:
-        purpose = db.query(Purpose).filter(Purpose.id == consent.purpose_id).first()
-        fiduciary = db.query(DataFiduciary).filter(
-            DataFiduciary.id == consent.fiduciary_id
-        ).first()
-        receipt = db.query(ConsentReceipt).filter(
-            ConsentReceipt.consent_id == consent.id
-        ).first()
+        purpose = consent.purpose
+        fiduciary = consent.fiduciary
+        receipt = consent.receipt
 
         consent_entry = {
             "consent_id": consent.uuid,
@@ -52,7 +53,7 @@ def get_user_export_data(db: Session, user: User) -> Dict[str, Any]:
             "purpose": {
                 "name": purpose.name if purpose else None,
                 "description": purpose.description if purpose else None,
-                "data_categories": json.loads(purpose.data_categories) if purpose else [],
+                "data_categories": purpose.data_categories if purpose else [],
                 "legal_basis": purpose.legal_basis if purpose else None,
                 "retention_period_days": purpose.retention_period_days if purpose else None,
             },
@@ -74,7 +75,7 @@ def get_user_export_data(db: Session, user: User) -> Dict[str, Any]:
             "action": log.action.value,
             "resource_type": log.resource_type,
             "resource_id": log.resource_id,
-            "details": json.loads(log.details) if log.details else None,
+            "details": log.details,
             "ip_address": log.ip_address,
             "timestamp": log.created_at.isoformat() if log.created_at else None,
         })
@@ -4,73 +4,115 @@ Handles generation of consent receipts and other PDF documents.
 
 This module provides a modular, reusable PDF generation system with
 consistent styling and structure for compliance documents.
+
+ReportLab is imported on first render, not with this module: the web
+process only submits work to the PDF pool, and ReportLab loads dozens of
+submodules and font metrics at import.
 """
+import hashlib
 import io
 import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.units import inch
+from cachetools import TTLCache
 
-from app.constants import PDFStyle
+from app.constants import PDFStyle, PDF_CACHE_MAX_ENTRIES, PDF_CACHE_TTL_SECONDS
 
+if TYPE_CHECKING:
+    from reportlab.platypus import Table
 
-class ConsentReceiptPDF:
-    """
-    Generator for consent receipt PDF documents.
+# ReportLab is pure Python and holds the GIL while rendering, so receipts
+# are built in worker processes instead of on the request thread
+_pdf_pool: Optional[ProcessPoolExecutor] = None
 
-    Creates legally compliant consent receipts with consistent styling,
-    supporting DPDP Act and GDPR requirements.
+# Rendered receipts, keyed by a digest of everything printed on them
+_pdf_cache_lock = threading.Lock()
+_pdf_cache: TTLCache = TTLCache(maxsize=PDF_CACHE_MAX_ENTRIES, ttl=PDF_CACHE_TTL_SECONDS)
 
-    Attributes:
-        buffer: BytesIO buffer to write PDF content.
-        styles: ReportLab style sheet for text formatting.
-        story: List of PDF elements (flowables).
-    """
 
-    def __init__(self):
-        """Initialize PDF generator with default styles."""
-        self.buffer = io.BytesIO()
-        self.styles = getSampleStyleSheet()
-        self.story: List[Any] = []
-        self._setup_custom_styles()
-
-    def _setup_custom_styles(self) -> None:
-        """Configure custom paragraph styles for the document."""
-        # Title style
-        self.title_style = ParagraphStyle(
+@lru_cache(maxsize=None)
+def _shared_styles() -> Dict[str, Any]:
+    """
+    Styles are read-only once built, so every document in a process shares
+    one set, built (and ReportLab imported) on the first render.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import TableStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        "sheet": styles,
+        "title": ParagraphStyle(
             'ConsentTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=PDFStyle.TITLE_FONT_SIZE,
             spaceAfter=PDFStyle.TITLE_SPACING,
             textColor=colors.HexColor(PDFStyle.PRIMARY_COLOR)
-        )
-
+        ),
         # Signature/code style
-        self.signature_style = ParagraphStyle(
+        "signature": ParagraphStyle(
             'Signature',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=PDFStyle.SIGNATURE_FONT_SIZE,
             fontName='Courier',
             backColor=colors.HexColor(PDFStyle.CODE_BG_COLOR),
             borderPadding=PDFStyle.CODE_BORDER_PADDING,
             wordWrap='CJK'
-        )
-
-        # Footer style
-        self.footer_style = ParagraphStyle(
+        ),
+        "footer": ParagraphStyle(
             'Footer',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=PDFStyle.FOOTER_FONT_SIZE,
             textColor=colors.HexColor(PDFStyle.FOOTER_COLOR),
             alignment=1  # Center aligned
-        )
+        ),
+        # Label/value tables used by every section
+        "kv_table": TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor(PDFStyle.HEADER_BG_COLOR)),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), PDFStyle.BODY_FONT_SIZE),
+            ('PADDING', (0, 0), (-1, -1), PDFStyle.CELL_PADDING),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor(PDFStyle.BORDER_COLOR)),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]),
+        "kv_col_widths": [PDFStyle.LABEL_COL_WIDTH * inch, PDFStyle.VALUE_COL_WIDTH * inch],
+    }
+
+
+class ConsentReceiptPDF:
+    """
+    Generator for consent receipt PDF documents.
+
+    Creates legally compliant consent receipts with consistent styling,
+    supporting DPDP Act and GDPR requirements.
 
-    def _create_table(self, data: List[List[str]]) -> Table:
+    Attributes:
+        buffer: BytesIO buffer to write PDF content.
+        styles: ReportLab style sheet for text formatting.
+        story: List of PDF elements (flowables).
+    """
+
+    def __init__(self):
+        """Initialize PDF generator with the shared module styles."""
+        shared = _shared_styles()
+        self.buffer = io.BytesIO()
+        self.styles = shared["sheet"]
+        self.story: List[Any] = []
+        self.title_style = shared["title"]
+        self.signature_style = shared["signature"]
+        self.footer_style = shared["footer"]
+        self._kv_table_style = shared["kv_table"]
+        self._kv_col_widths = shared["kv_col_widths"]
+
+    def _create_table(self, data: List[List[str]]) -> "Table":
         """
         Create a styled data table.
 
@@ -80,19 +122,9 @@ class ConsentReceiptPDF:
         Returns:
             Configured Table object with consistent styling.
         """
-        table = Table(
-            data,
-            colWidths=[PDFStyle.LABEL_COL_WIDTH * inch, PDFStyle.VALUE_COL_WIDTH * inch]
-        )
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor(PDFStyle.HEADER_BG_COLOR)),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), PDFStyle.BODY_FONT_SIZE),
-            ('PADDING', (0, 0), (-1, -1), PDFStyle.CELL_PADDING),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor(PDFStyle.BORDER_COLOR)),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        return table
+        from reportlab.platypus import Table
+
+        return Table(data, colWidths=self._kv_col_widths, style=self._kv_table_style)
 
     def _add_section(self, title: str, data: List[List[str]]) -> None:
         """
@@ -102,6 +134,8 @@ class ConsentReceiptPDF:
             title: Section heading text.
             data: Table data for the section.
         """
+        from reportlab.platypus import Paragraph, Spacer
+
         self.story.append(Paragraph(title, self.styles['Heading2']))
         self.story.append(self._create_table(data))
         self.story.append(Spacer(1, PDFStyle.SECTION_SPACING))
@@ -147,6 +181,10 @@ class ConsentReceiptPDF:
         Returns:
             BytesIO buffer containing the generated PDF.
         """
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
         doc = SimpleDocTemplate(
             self.buffer,
             pagesize=letter,
@@ -268,3 +306,77 @@ def generate_consent_receipt_pdf(
         retention_days=retention_days,
         signature=signature
     )
+
+
+def render_consent_receipt_pdf(**receipt_fields: Any) -> bytes:
+    """
+    Render a consent receipt to bytes (picklable, for the process pool).
+
+    Args:
+        receipt_fields: Keyword arguments of generate_consent_receipt_pdf().
+
+    Returns:
+        The PDF document.
+    """
+    return generate_consent_receipt_pdf(**receipt_fields).getvalue()
+
+
+def start_pdf_pool() -> None:
+    """Start the receipt rendering processes (one per CPU)"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        # spawn, not fork: forking a process that already runs threads
+        # can copy held locks into the child
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the rendering processes, letting queued receipts finish"""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=True)
+        _pdf_pool = None
+
+
+def render_consent_receipt_pdf_offloaded(**receipt_fields: Any) -> bytes:
+    """
+    Render a consent receipt in the process pool.
+
+    Blocks the calling thread until the PDF is ready, but without the GIL,
+    so other requests keep running. Renders inline if the pool is not
+    running (e.g. outside the web app).
+    """
+    if _pdf_pool is None:
+        return render_consent_receipt_pdf(**receipt_fields)
+    return _pdf_pool.submit(render_consent_receipt_pdf, **receipt_fields).result()
+
+
+def receipt_pdf_key(**receipt_fields: Any) -> str:
+    """
+    Digest of every value printed on a receipt.
+
+    Covers the signed receipt plus what can change after signing (status,
+    current names and purpose text), so an updated receipt never matches
+    an old PDF. Also used as the download's ETag.
+    """
+    return hashlib.blake2b(
+        repr(sorted(receipt_fields.items())).encode(),
+        digest_size=16
+    ).hexdigest()
+
+
+def get_consent_receipt_pdf(key: str, **receipt_fields: Any) -> bytes:
+    """
+    Rendered receipt for receipt_pdf_key(**receipt_fields), from the cache
+    or the PDF worker processes.
+    """
+    with _pdf_cache_lock:
+        pdf = _pdf_cache.get(key)
+    if pdf is None:
+        pdf = render_consent_receipt_pdf_offloaded(**receipt_fields)
+        with _pdf_cache_lock:
+            _pdf_cache[key] = pdf
+    return pdf
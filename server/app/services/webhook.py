@@ -1,17 +1,95 @@
 """
 Webhook Service - Delivery and management
 """
+import asyncio
 import json
 import hmac
-import hashlib
+import logging
 import secrets
-from datetime import datetime, timedelta
-from typing import Optional, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Tuple
 import httpx
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.orm import Session
 
+from app.constants import (
+    WEBHOOK_TIMEOUT_SECONDS, WEBHOOK_MAX_RETRIES, WEBHOOK_RETRY_DELAYS,
+    WEBHOOK_RETRY_INTERVAL_SECONDS, WEBHOOK_RETRY_BATCH_SIZE,
+    WEBHOOK_RETRY_CONCURRENCY, WEBHOOK_RETRY_LEASE_SECONDS,
+    WEBHOOK_MAX_CONNECTIONS, WEBHOOK_MAX_KEEPALIVE_CONNECTIONS
+)
+from app.database import SessionLocal, generate_uuid
 from app.models import Webhook, WebhookDelivery, WebhookStatus, WebhookEvent, DataFiduciary
 
+logger = logging.getLogger(__name__)
+
+# Pooled client for immediate deliveries (webhook tests sent from the
+# request), shared by all request threads so connections stay alive
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+# Client and thread pool of the delivery worker, kept for the life of the
+# process so every pass reuses warm connections and threads
+_worker_client: Optional[httpx.Client] = None
+_worker_pool: Optional[ThreadPoolExecutor] = None
+
+# Set while the delivery worker runs in this process, so request threads
+# can wake it as soon as they commit queued deliveries
+_worker_wakeup: Optional[asyncio.Event] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _http_client() -> httpx.Client:
+    """The shared delivery client, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    timeout=WEBHOOK_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(
+                        max_connections=WEBHOOK_MAX_CONNECTIONS,
+                        max_keepalive_connections=WEBHOOK_MAX_KEEPALIVE_CONNECTIONS
+                    )
+                )
+    return _client
+
+
+def _worker_resources() -> Tuple[httpx.Client, ThreadPoolExecutor]:
+    """The delivery worker's client and thread pool, created on first use"""
+    global _worker_client, _worker_pool
+    if _worker_client is None:
+        with _client_lock:
+            if _worker_client is None:
+                _worker_pool = ThreadPoolExecutor(
+                    max_workers=WEBHOOK_RETRY_CONCURRENCY, thread_name_prefix="webhook"
+                )
+                _worker_client = httpx.Client(
+                    timeout=WEBHOOK_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(
+                        max_connections=WEBHOOK_RETRY_CONCURRENCY,
+                        max_keepalive_connections=WEBHOOK_RETRY_CONCURRENCY
+                    )
+                )
+    return _worker_client, _worker_pool
+
+
+def close_http_client() -> None:
+    """Close the shared delivery clients and worker pool (application shutdown)"""
+    global _client, _worker_client, _worker_pool
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        if _worker_pool is not None:
+            _worker_pool.shutdown(wait=True)
+            _worker_pool = None
+        if _worker_client is not None:
+            _worker_client.close()
+            _worker_client = None
+
 
 def generate_webhook_secret() -> str:
     """Generate a secure webhook secret"""
@@ -19,12 +97,16 @@ def generate_webhook_secret() -> str:
 
 
 def generate_signature(payload: str, secret: str) -> str:
-    """Generate HMAC-SHA256 signature for payload verification"""
-    return hmac.new(
+    """
+    Generate HMAC-SHA256 signature for payload verification.
+    hmac.digest runs the whole MAC in OpenSSL in one call, without
+    building an HMAC object per delivery.
+    """
+    return hmac.digest(
         secret.encode('utf-8'),
         payload.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
+        'sha256'
+    ).hex()
 
 
 def verify_signature(payload: str, signature: str, secret: str) -> bool:
@@ -38,7 +120,8 @@ def create_webhook(
     fiduciary_id: int,
     name: str,
     url: str,
-    events: List[str]
+    events: List[str],
+    batch_events: bool = False
 ) -> Webhook:
     """Create a new webhook for a fiduciary"""
     webhook = Webhook(
@@ -46,12 +129,12 @@ def create_webhook(
         name=name,
         url=str(url),
         secret=generate_webhook_secret(),
-        events=json.dumps(events),
+        events=events,
+        batch_events=batch_events,
         is_active=True
     )
     db.add(webhook)
     db.commit()
-    db.refresh(webhook)
     return webhook
 
 
@@ -61,6 +144,7 @@ def update_webhook(
     name: Optional[str] = None,
     url: Optional[str] = None,
     events: Optional[List[str]] = None,
+    batch_events: Optional[bool] = None,
     is_active: Optional[bool] = None
 ) -> Webhook:
     """Update webhook configuration"""
@@ -69,12 +153,13 @@ def update_webhook(
     if url is not None:
         webhook.url = str(url)
     if events is not None:
-        webhook.events = json.dumps(events)
+        webhook.events = events
+    if batch_events is not None:
+        webhook.batch_events = batch_events
     if is_active is not None:
         webhook.is_active = is_active
 
     db.commit()
-    db.refresh(webhook)
     return webhook
 
 
@@ -123,10 +208,81 @@ def should_trigger_webhook(webhook: Webhook, event_type: str) -> bool:
     if not webhook.is_active:
         return False
 
-    events = json.loads(webhook.events)
+    events = webhook.events
     return WebhookEvent.ALL.value in events or event_type in events
 
 
+def _next_retry_at(attempt_count: int) -> Optional[datetime]:
+    """When to retry after a failed attempt, or None once retries are exhausted"""
+    if attempt_count > WEBHOOK_MAX_RETRIES:
+        return None
+    delay = WEBHOOK_RETRY_DELAYS[min(attempt_count, len(WEBHOOK_RETRY_DELAYS)) - 1]
+    return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+
+def _post_payload(
+    client: httpx.Client,
+    url: str,
+    secret: str,
+    delivery_uuid: str,
+    event_type: str,
+    payload: str
+) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    """
+    POST a signed payload to a webhook endpoint.
+    Touches no database state, so it is safe to run from worker threads.
+
+    Returns:
+        (response_code, response_body, error_message); error_message is
+        None when the endpoint answered with a 2xx status.
+    """
+    signature = generate_signature(payload, secret)
+    try:
+        response = client.post(
+            url,
+            content=payload,
+            headers={
+                "Content-Type": "application/json",
+                "X-Eigensparse-Signature": signature,
+                "X-Eigensparse-Event": event_type,
+                "X-Eigensparse-Timestamp": datetime.utcnow().isoformat(),
+                "X-Eigensparse-Delivery-ID": delivery_uuid
+            }
+        )
+    except httpx.TimeoutException:
+        return None, None, "Request timed out"
+    except httpx.RequestError as e:
+        return None, None, str(e)[:500]
+    except Exception as e:
+        return None, None, f"Unexpected error: {str(e)[:500]}"
+
+    body = response.text[:1000] if response.text else None
+    if 200 <= response.status_code < 300:
+        return response.status_code, body, None
+    return response.status_code, body, f"HTTP {response.status_code}"
+
+
+def _attempt_outcome(
+    attempt_count: int,
+    result: Tuple[Optional[int], Optional[str], Optional[str]]
+) -> dict:
+    """Column values recording the outcome of one delivery attempt"""
+    response_code, response_body, error_message = result
+    values = {
+        "response_code": response_code,
+        "response_body": response_body,
+        "error_message": error_message,
+    }
+    if error_message is None:
+        values["status"] = WebhookStatus.SUCCESS
+        values["delivered_at"] = datetime.now(timezone.utc)
+        values["next_retry_at"] = None
+    else:
+        values["status"] = WebhookStatus.FAILED
+        values["next_retry_at"] = _next_retry_at(attempt_count)
+    return values
+
+
 def deliver_webhook(
     db: Session,
     webhook: Webhook,
@@ -142,64 +298,185 @@ def deliver_webhook(
         "data": data
     }
     payload = json.dumps(payload_dict, default=str)
-    signature = generate_signature(payload, webhook.secret)
 
     # Create delivery record
     delivery = WebhookDelivery(
         webhook_id=webhook.id,
         event_type=event_type,
-        payload=payload,
+        payload=payload_dict,
         status=WebhookStatus.PENDING,
         attempt_count=1
     )
     db.add(delivery)
     db.commit()
-    db.refresh(delivery)
 
     # Attempt delivery
-    try:
-        with httpx.Client(timeout=10.0) as client:
-            response = client.post(
-                webhook.url,
-                content=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-Eigensparse-Signature": signature,
-                    "X-Eigensparse-Event": event_type,
-                    "X-Eigensparse-Timestamp": timestamp.isoformat(),
-                    "X-Eigensparse-Delivery-ID": delivery.uuid
-                }
-            )
+    result = _post_payload(
+        _http_client(), webhook.url, webhook.secret, delivery.uuid, event_type, payload
+    )
+    for column, value in _attempt_outcome(delivery.attempt_count, result).items():
+        setattr(delivery, column, value)
+    if event_type == "test":
+        # Test results are reported to the caller; the worker must not resend them
+        delivery.next_retry_at = None
 
-            delivery.response_code = response.status_code
-            delivery.response_body = response.text[:1000] if response.text else None
+    db.commit()
+    return delivery
 
-            if 200 <= response.status_code < 300:
-                delivery.status = WebhookStatus.SUCCESS
-                delivery.delivered_at = datetime.utcnow()
-            else:
-                delivery.status = WebhookStatus.FAILED
-                delivery.error_message = f"HTTP {response.status_code}"
-                # Schedule retry
-                delivery.next_retry_at = datetime.utcnow() + timedelta(minutes=5)
 
-    except httpx.TimeoutException:
-        delivery.status = WebhookStatus.FAILED
-        delivery.error_message = "Request timed out"
-        delivery.next_retry_at = datetime.utcnow() + timedelta(minutes=5)
+def _post_batch(
+    client: httpx.Client,
+    endpoints: dict,
+    batch: list
+) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    """
+    Send claimed deliveries for one endpoint: a single delivery as its own
+    payload, several as {"events": [...]} with each event's delivery_id.
+    """
+    endpoint = endpoints[batch[0].webhook_id]
+    if len(batch) == 1 and not endpoint.batch_events:
+        c = batch[0]
+        return _post_payload(
+            client, endpoint.url, endpoint.secret, c.uuid, c.event_type,
+            json.dumps(c.payload)
+        )
+    payload = json.dumps({
+        "events": [{"delivery_id": str(c.uuid), **c.payload} for c in batch]
+    })
+    return _post_payload(
+        client, endpoint.url, endpoint.secret, generate_uuid(), "batch", payload
+    )
 
-    except httpx.RequestError as e:
-        delivery.status = WebhookStatus.FAILED
-        delivery.error_message = str(e)[:500]
-        delivery.next_retry_at = datetime.utcnow() + timedelta(minutes=5)
 
-    except Exception as e:
-        delivery.status = WebhookStatus.FAILED
-        delivery.error_message = f"Unexpected error: {str(e)[:500]}"
+def retry_due_deliveries(db: Session, batch_size: int = WEBHOOK_RETRY_BATCH_SIZE) -> int:
+    """
+    Send queued deliveries and retry failed ones whose next_retry_at has
+    passed.
+
+    Due rows are claimed in one UPDATE ... RETURNING over a
+    SELECT ... FOR UPDATE SKIP LOCKED subquery, which marks them RETRYING
+    with a lease; the claim is committed so no transaction stays open
+    during HTTP calls. Concurrent workers (one per app process) therefore
+    never pick the same delivery, and a claim abandoned by a crashed
+    worker becomes due again once its lease expires.
+
+    Deliveries are sent in parallel over one pooled HTTP client, grouped
+    by webhook so requests to the same endpoint reuse connections, and
+    all outcomes are written back with one batched executemany UPDATE.
+    For webhooks with batch_events, everything claimed for the endpoint
+    goes out as a single {"events": [...]} POST (queue batching: whatever
+    is due now, no waiting for a batch to fill).
+
+    Returns:
+        Number of deliveries attempted.
+    """
+    now = datetime.now(timezone.utc)
+    due_ids = select(WebhookDelivery.id).where(
+        WebhookDelivery.status.in_([
+            WebhookStatus.PENDING, WebhookStatus.FAILED, WebhookStatus.RETRYING
+        ]),
+        WebhookDelivery.next_retry_at <= now
+    ).order_by(
+        WebhookDelivery.next_retry_at
+    ).limit(batch_size).with_for_update(skip_locked=True)
+
+    claimed = db.execute(
+        update(WebhookDelivery)
+        .where(WebhookDelivery.id.in_(due_ids.scalar_subquery()))
+        .values(
+            status=WebhookStatus.RETRYING,
+            attempt_count=func.coalesce(WebhookDelivery.attempt_count, 0) + 1,
+            next_retry_at=now + timedelta(seconds=WEBHOOK_RETRY_LEASE_SECONDS)
+        )
+        .returning(
+            WebhookDelivery.id, WebhookDelivery.webhook_id, WebhookDelivery.uuid,
+            WebhookDelivery.event_type, WebhookDelivery.payload,
+            WebhookDelivery.attempt_count
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+
+    if not claimed:
+        return 0
+
+    endpoints = dict(
+        (row.id, row)
+        for row in db.execute(
+            select(Webhook.id, Webhook.url, Webhook.secret, Webhook.batch_events).where(
+                Webhook.id.in_({c.webhook_id for c in claimed}),
+                Webhook.is_active == True
+            )
+        )
+    )
 
+    outcomes = []
+    # One request per delivery, or per endpoint for batching webhooks
+    sends: dict = {}
+    for c in sorted(claimed, key=lambda c: c.webhook_id):
+        endpoint = endpoints.get(c.webhook_id)
+        if endpoint is not None:
+            key = c.webhook_id if endpoint.batch_events else ("single", c.id)
+            sends.setdefault(key, []).append(c)
+        else:
+            # Endpoint disabled since the first attempt: stop retrying
+            outcomes.append({
+                "id": c.id,
+                "status": WebhookStatus.FAILED,
+                "error_message": "Webhook disabled",
+                "next_retry_at": None,
+            })
+
+    client, pool = _worker_resources()
+    batches = list(sends.values())
+    results = pool.map(lambda batch: _post_batch(client, endpoints, batch), batches)
+    for batch, result in zip(batches, results):
+        for c in batch:
+            outcomes.append({"id": c.id, **_attempt_outcome(c.attempt_count, result)})
+
+    # Bulk UPDATE by primary key: one executemany for the whole batch
+    db.execute(update(WebhookDelivery), outcomes)
     db.commit()
-    db.refresh(delivery)
-    return delivery
+    return len(claimed)
+
+
+async def run_webhook_retry_worker() -> None:
+    """
+    Background loop delivering queued and due-for-retry webhooks.
+    Started on application startup; the blocking work runs in a thread.
+    Polls every WEBHOOK_RETRY_INTERVAL_SECONDS, or sooner when woken by
+    notify_webhook_worker().
+    """
+    global _worker_wakeup, _worker_loop
+    _worker_wakeup = asyncio.Event()
+    _worker_loop = asyncio.get_running_loop()
+
+    while True:
+        _worker_wakeup.clear()
+        try:
+            while await asyncio.to_thread(_retry_due_batch) >= WEBHOOK_RETRY_BATCH_SIZE:
+                pass  # full batch: more may be due, keep draining
+        except Exception:
+            logger.exception("Webhook retry run failed")
+        try:
+            await asyncio.wait_for(_worker_wakeup.wait(), WEBHOOK_RETRY_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def notify_webhook_worker() -> None:
+    """
+    Wake this process's delivery worker. Call after committing deliveries
+    queued with enqueue_consent_webhooks(); safe from request threads.
+    """
+    if _worker_wakeup is not None:
+        _worker_loop.call_soon_threadsafe(_worker_wakeup.set)
+
+
+def _retry_due_batch() -> int:
+    """Run one retry batch with its own session"""
+    with SessionLocal() as db:
+        return retry_due_deliveries(db)
 
 
 def test_webhook(db: Session, webhook: Webhook) -> dict:
@@ -226,27 +503,54 @@ def test_webhook(db: Session, webhook: Webhook) -> dict:
     }
 
 
-def trigger_consent_webhooks(
+def enqueue_consent_webhooks(
     db: Session,
     fiduciary_id: int,
     event_type: str,
     consent_data: dict
-) -> List[WebhookDelivery]:
-    """Trigger all relevant webhooks for a consent event"""
-    webhooks = db.query(Webhook).filter(
-        Webhook.fiduciary_id == fiduciary_id,
-        Webhook.is_active == True
-    ).all()
-
-    deliveries = []
-    for webhook in webhooks:
-        if should_trigger_webhook(webhook, event_type):
-            delivery = deliver_webhook(
-                db=db,
-                webhook=webhook,
-                event_type=event_type,
-                data=consent_data
+) -> int:
+    """
+    Queue a consent event for every subscribed webhook (transactional outbox).
+
+    Adds one PENDING delivery per subscriber, due immediately, to the
+    caller's transaction without committing: the event is recorded if and
+    only if the consent change commits. The delivery worker sends it, so
+    no subscriber HTTP call runs on the request path. Call
+    notify_webhook_worker() after the commit to send without waiting for
+    the next poll.
+
+    Returns:
+        Number of deliveries queued.
+    """
+    # Subscription match runs in SQL (GIN index on events)
+    webhook_ids = db.scalars(
+        select(Webhook.id).where(
+            Webhook.fiduciary_id == fiduciary_id,
+            Webhook.is_active == True,
+            or_(
+                Webhook.events.contains([event_type]),
+                Webhook.events.contains([WebhookEvent.ALL.value])
             )
-            deliveries.append(delivery)
+        )
+    ).all()
+    if not webhook_ids:
+        return 0
 
-    return deliveries
+    payload_dict = {
+        "event": event_type,
+        "timestamp": datetime.utcnow().isoformat(),
+        "data": consent_data
+    }
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        WebhookDelivery(
+            webhook_id=webhook_id,
+            event_type=event_type,
+            payload=payload_dict,
+            status=WebhookStatus.PENDING,
+            attempt_count=0,
+            next_retry_at=now
+        )
+        for webhook_id in webhook_ids
+    ])
+    return len(webhook_ids)
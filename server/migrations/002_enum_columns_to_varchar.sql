@@ -0,0 +1,23 @@
+-- Migration: Store audit actions and consent statuses as VARCHAR
+-- Date: 2026-10-16
+-- Description: Replaces the native PostgreSQL enum types with VARCHAR(32)
+-- columns guarded by CHECK constraints. Values are the enum member names,
+-- matching what SQLAlchemy already stored in the enum columns.
+
+-- Audit log actions
+ALTER TABLE audit_logs ALTER COLUMN action TYPE VARCHAR(32) USING action::text;
+ALTER TABLE audit_logs DROP CONSTRAINT IF EXISTS ck_audit_action;
+ALTER TABLE audit_logs ADD CONSTRAINT ck_audit_action CHECK (action IN (
+    'CONSENT_GRANTED', 'CONSENT_REVOKED', 'CONSENT_RENEWED', 'CONSENT_EXPIRED',
+    'CONSENT_UPDATED', 'PURPOSE_CREATED', 'USER_REGISTERED', 'EMAIL_VERIFIED',
+    'PASSWORD_RESET', 'DATA_ACCESSED', 'RECEIPT_GENERATED'
+));
+DROP TYPE IF EXISTS auditaction;
+
+-- Consent statuses
+ALTER TABLE consents ALTER COLUMN status TYPE VARCHAR(32) USING status::text;
+ALTER TABLE consents DROP CONSTRAINT IF EXISTS ck_consent_status;
+ALTER TABLE consents ADD CONSTRAINT ck_consent_status CHECK (status IN (
+    'GRANTED', 'REVOKED', 'EXPIRED'
+));
+DROP TYPE IF EXISTS consentstatus;
@@ -0,0 +1,16 @@
+-- Migration: Composite indexes for audit log listings
+-- Date: 2026-10-16
+-- Description: Lets per-user / per-fiduciary audit listings walk an index in
+-- (created_at DESC, id DESC) order and stop at LIMIT instead of sorting.
+-- The leading columns also cover the old single-column indexes.
+
+CREATE INDEX IF NOT EXISTS ix_audit_user_created
+    ON audit_logs (user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_audit_fiduciary_created
+    ON audit_logs (fiduciary_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_audit_user_action_created
+    ON audit_logs (user_id, action, created_at DESC);
+
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS ix_audit_logs_user_id;
+DROP INDEX IF EXISTS ix_audit_logs_fiduciary_id;
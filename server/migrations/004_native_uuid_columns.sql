@@ -0,0 +1,15 @@
+-- Migration: Store public identifiers as native UUID
+-- Date: 2026-10-16
+-- Description: Converts the VARCHAR(36) uuid columns to PostgreSQL's 16-byte
+-- UUID type. Existing values are canonical lowercase UUID strings, so the
+-- cast is lossless and the API keeps returning the same identifiers.
+-- audit_logs.resource_id stays VARCHAR: it is free-form and never queried.
+
+ALTER TABLE users ALTER COLUMN uuid TYPE UUID USING uuid::uuid;
+ALTER TABLE data_fiduciaries ALTER COLUMN uuid TYPE UUID USING uuid::uuid;
+ALTER TABLE purposes ALTER COLUMN uuid TYPE UUID USING uuid::uuid;
+ALTER TABLE consents ALTER COLUMN uuid TYPE UUID USING uuid::uuid;
+ALTER TABLE consent_receipts ALTER COLUMN receipt_id TYPE UUID USING receipt_id::uuid;
+ALTER TABLE audit_logs ALTER COLUMN uuid TYPE UUID USING uuid::uuid;
+ALTER TABLE webhooks ALTER COLUMN uuid TYPE UUID USING uuid::uuid;
+ALTER TABLE webhook_deliveries ALTER COLUMN uuid TYPE UUID USING uuid::uuid;
@@ -0,0 +1,24 @@
+-- Migration: Store fiduciary API keys as SHA-256 hashes
+-- Date: 2026-10-16
+-- Description: Replaces the plaintext api_key column with api_key_hash
+-- (hex SHA-256, unique) plus the prefix/suffix shown in the masked hint.
+-- Existing keys keep working: the app hashes the presented key the same way.
+
+ALTER TABLE data_fiduciaries ADD COLUMN IF NOT EXISTS api_key_hash VARCHAR(64);
+ALTER TABLE data_fiduciaries ADD COLUMN IF NOT EXISTS api_key_prefix VARCHAR(8);
+ALTER TABLE data_fiduciaries ADD COLUMN IF NOT EXISTS api_key_suffix VARCHAR(4);
+
+UPDATE data_fiduciaries
+SET api_key_hash = encode(sha256(convert_to(api_key, 'UTF8')), 'hex'),
+    api_key_prefix = left(api_key, 8),
+    api_key_suffix = right(api_key, 4)
+WHERE api_key_hash IS NULL;
+
+ALTER TABLE data_fiduciaries ALTER COLUMN api_key_hash SET NOT NULL;
+ALTER TABLE data_fiduciaries ALTER COLUMN api_key_prefix SET NOT NULL;
+ALTER TABLE data_fiduciaries ALTER COLUMN api_key_suffix SET NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS ix_data_fiduciaries_api_key_hash
+    ON data_fiduciaries (api_key_hash);
+
+-- Drop the plaintext keys (and their unique index)
+ALTER TABLE data_fiduciaries DROP COLUMN IF EXISTS api_key;
@@ -0,0 +1,7 @@
+-- Migration: Index for the webhook retry worker
+-- Date: 2026-10-16
+-- Description: The background worker polls for deliveries that are due for
+-- retry by (status, next_retry_at); this keeps the poll an index range scan.
+
+CREATE INDEX IF NOT EXISTS ix_webhook_deliveries_status_retry
+    ON webhook_deliveries (status, next_retry_at);
@@ -0,0 +1,64 @@
+-- Migration: Partition audit_logs by month
+-- Date: 2026-10-16
+-- Description: Recreates audit_logs as a table range-partitioned on
+-- created_at, with one child table per month (audit_logs_YYYY_MM) and a
+-- default partition. Listings filtered by time only scan the matching
+-- months, and retention becomes DROP TABLE audit_logs_YYYY_MM instead of
+-- DELETE + VACUUM. The partition key must be part of the primary key and
+-- of every unique constraint, so the key becomes (id, created_at) and
+-- uuid keeps a plain index. Requires PostgreSQL 11+.
+-- The application creates upcoming monthly partitions on startup and
+-- daily afterwards.
+
+BEGIN;
+
+UPDATE audit_logs SET created_at = now() WHERE created_at IS NULL;
+
+ALTER TABLE audit_logs RENAME TO audit_logs_old;
+
+CREATE TABLE audit_logs (
+    LIKE audit_logs_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE (created_at);
+ALTER TABLE audit_logs ALTER COLUMN created_at SET NOT NULL;
+
+-- One partition per month from the oldest entry through two months ahead
+DO $$
+DECLARE
+    month date := date_trunc('month', COALESCE(
+        (SELECT min(created_at) FROM audit_logs_old), now()
+    ))::date;
+    last_month date := (date_trunc('month', now()) + interval '2 months')::date;
+BEGIN
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'audit_logs_' || to_char(month, 'YYYY_MM'),
+            month,
+            (month + interval '1 month')::date
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+END $$;
+
+CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+INSERT INTO audit_logs SELECT * FROM audit_logs_old;
+
+-- Keep the id sequence alive when the old table goes
+ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id;
+DROP TABLE audit_logs_old;
+
+ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at);
+ALTER TABLE audit_logs
+    ADD CONSTRAINT audit_logs_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id);
+ALTER TABLE audit_logs
+    ADD CONSTRAINT audit_logs_fiduciary_id_fkey FOREIGN KEY (fiduciary_id) REFERENCES data_fiduciaries (id);
+
+-- Indexes are defined on the parent and cascade to every partition
+CREATE INDEX ix_audit_logs_uuid ON audit_logs (uuid);
+CREATE INDEX ix_audit_logs_action ON audit_logs (action);
+CREATE INDEX ix_audit_user_created ON audit_logs (user_id, created_at DESC, id DESC);
+CREATE INDEX ix_audit_fiduciary_created ON audit_logs (fiduciary_id, created_at DESC, id DESC);
+CREATE INDEX ix_audit_user_action_created ON audit_logs (user_id, action, created_at DESC);
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- Migration: Store JSON columns as JSONB
+-- Date: 2026-10-16
+-- Description: Converts the JSON-in-TEXT columns to JSONB so the database
+-- parses them once on write and the driver hands back Python objects.
+-- Adds a GIN index on webhooks.events for the containment query used when
+-- dispatching events (events @> '["consent.granted"]').
+
+BEGIN;
+
+ALTER TABLE audit_logs ALTER COLUMN details TYPE JSONB USING details::jsonb;
+ALTER TABLE consent_receipts ALTER COLUMN receipt_data TYPE JSONB USING receipt_data::jsonb;
+ALTER TABLE purposes ALTER COLUMN data_categories TYPE JSONB USING data_categories::jsonb;
+ALTER TABLE webhooks ALTER COLUMN events TYPE JSONB USING events::jsonb;
+ALTER TABLE webhook_deliveries ALTER COLUMN payload TYPE JSONB USING payload::jsonb;
+
+CREATE INDEX IF NOT EXISTS ix_webhooks_events
+    ON webhooks USING GIN (events jsonb_path_ops);
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- Migration: Partial indexes for live consents
+-- Date: 2026-10-16
+-- Description: Indexes only GRANTED consents (status holds enum names),
+-- so "active consents for user / fiduciary X" scans the live working set
+-- instead of the full history. The application marks lapsed consents
+-- EXPIRED in an hourly sweep, which keeps these indexes small.
+
+CREATE INDEX IF NOT EXISTS ix_consents_active
+    ON consents (user_id, expires_at) WHERE status = 'GRANTED';
+CREATE INDEX IF NOT EXISTS ix_consents_fiduciary_active
+    ON consents (fiduciary_id, expires_at) WHERE status = 'GRANTED';
@@ -0,0 +1,14 @@
+-- Migration: Drop redundant indexes
+-- Date: 2026-10-16
+-- Description: Every primary key already has its own unique index, so the
+-- extra ix_<table>_id indexes only added a write per INSERT. Audit log
+-- entries are never looked up by uuid, so that index goes as well.
+
+DROP INDEX IF EXISTS ix_users_id;
+DROP INDEX IF EXISTS ix_data_fiduciaries_id;
+DROP INDEX IF EXISTS ix_purposes_id;
+DROP INDEX IF EXISTS ix_consents_id;
+DROP INDEX IF EXISTS ix_consent_receipts_id;
+DROP INDEX IF EXISTS ix_webhooks_id;
+DROP INDEX IF EXISTS ix_webhook_deliveries_id;
+DROP INDEX IF EXISTS ix_audit_logs_uuid;
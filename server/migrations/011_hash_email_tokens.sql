@@ -0,0 +1,39 @@
+-- Migration: Store email verification / password reset tokens hashed
+-- Date: 2026-10-16
+-- Description: Replaces the plaintext token columns with SHA-256 hex
+-- digests (fixed 64 characters) and indexes them. Outstanding tokens keep
+-- working: they are hashed in place, and the application hashes incoming
+-- tokens before looking them up. Requires PostgreSQL 11+ for sha256().
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_users_verification_token;
+DROP INDEX IF EXISTS idx_users_reset_token;
+DROP INDEX IF EXISTS idx_fiduciaries_verification_token;
+DROP INDEX IF EXISTS idx_fiduciaries_reset_token;
+
+UPDATE users SET
+    verification_token = encode(sha256(convert_to(verification_token, 'UTF8')), 'hex'),
+    reset_token = encode(sha256(convert_to(reset_token, 'UTF8')), 'hex');
+UPDATE data_fiduciaries SET
+    verification_token = encode(sha256(convert_to(verification_token, 'UTF8')), 'hex'),
+    reset_token = encode(sha256(convert_to(reset_token, 'UTF8')), 'hex');
+
+ALTER TABLE users RENAME COLUMN verification_token TO verification_token_hash;
+ALTER TABLE users RENAME COLUMN reset_token TO reset_token_hash;
+ALTER TABLE users ALTER COLUMN verification_token_hash TYPE VARCHAR(64);
+ALTER TABLE users ALTER COLUMN reset_token_hash TYPE VARCHAR(64);
+
+ALTER TABLE data_fiduciaries RENAME COLUMN verification_token TO verification_token_hash;
+ALTER TABLE data_fiduciaries RENAME COLUMN reset_token TO reset_token_hash;
+ALTER TABLE data_fiduciaries ALTER COLUMN verification_token_hash TYPE VARCHAR(64);
+ALTER TABLE data_fiduciaries ALTER COLUMN reset_token_hash TYPE VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS ix_users_verification_token_hash ON users (verification_token_hash);
+CREATE INDEX IF NOT EXISTS ix_users_reset_token_hash ON users (reset_token_hash);
+CREATE INDEX IF NOT EXISTS ix_data_fiduciaries_verification_token_hash
+    ON data_fiduciaries (verification_token_hash);
+CREATE INDEX IF NOT EXISTS ix_data_fiduciaries_reset_token_hash
+    ON data_fiduciaries (reset_token_hash);
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- Migration: Store the masked API key hint
+-- Date: 2026-10-16
+-- Description: Adds api_key_hint ("<prefix>****<suffix>"), written when a
+-- key is issued, so /fiduciary/me no longer builds it on every request.
+
+ALTER TABLE data_fiduciaries ADD COLUMN IF NOT EXISTS api_key_hint VARCHAR(16);
+UPDATE data_fiduciaries
+    SET api_key_hint = api_key_prefix || '****' || api_key_suffix
+    WHERE api_key_hint IS NULL;
+ALTER TABLE data_fiduciaries ALTER COLUMN api_key_hint SET NOT NULL;
@@ -0,0 +1,8 @@
+-- Migration: Require a stored password hash for every fiduciary
+-- Date: 2026-10-16
+-- Description: Fiduciaries created before password login (API key only)
+-- have a NULL hashed_password. They get the unusable marker '!' instead,
+-- which never verifies, so the column can be NOT NULL like users'.
+
+UPDATE data_fiduciaries SET hashed_password = '!' WHERE hashed_password IS NULL;
+ALTER TABLE data_fiduciaries ALTER COLUMN hashed_password SET NOT NULL;
@@ -0,0 +1,37 @@
+-- Migration: Case-insensitive email lookups
+-- Date: 2026-10-16
+-- Description: Login, resend-verification, forgot-password and the SDK
+-- consent check now compare lower(email) against a lower-cased input, and
+-- registration uses the lower(email) index as its ON CONFLICT target.
+-- New addresses are stored lower-cased; existing rows are left as-is and
+-- still match through these expression indexes, which are UNIQUE so an
+-- address can belong to only one account whatever its casing.
+--
+-- Accounts that differ from an older account only by email casing would
+-- block the unique indexes (and made lookups pick either row). The oldest
+-- account keeps the address; newer ones get "+duplicate-<id>" added to
+-- the local part and must be merged or re-addressed by an operator.
+
+UPDATE users u
+SET email = split_part(u.email, '@', 1) || '+duplicate-' || u.id
+            || '@' || split_part(u.email, '@', 2)
+WHERE EXISTS (
+    SELECT 1 FROM users older
+    WHERE lower(older.email) = lower(u.email) AND older.id < u.id
+);
+
+UPDATE data_fiduciaries f
+SET contact_email = split_part(f.contact_email, '@', 1) || '+duplicate-' || f.id
+                    || '@' || split_part(f.contact_email, '@', 2)
+WHERE EXISTS (
+    SELECT 1 FROM data_fiduciaries older
+    WHERE lower(older.contact_email) = lower(f.contact_email) AND older.id < f.id
+);
+
+-- Replace the non-unique versions if an earlier run created them
+DROP INDEX IF EXISTS ix_users_email_lower;
+DROP INDEX IF EXISTS ix_data_fiduciaries_contact_email_lower;
+
+CREATE UNIQUE INDEX ix_users_email_lower ON users (lower(email));
+CREATE UNIQUE INDEX ix_data_fiduciaries_contact_email_lower
+    ON data_fiduciaries (lower(contact_email));
@@ -0,0 +1,30 @@
+-- Migration: One active consent per user and purpose
+-- Date: 2026-10-16
+-- Description: Grant now inserts with ON CONFLICT DO NOTHING against this
+-- partial unique index instead of checking for an active consent first,
+-- so concurrent grants for the same purpose cannot both succeed.
+-- Any duplicates left by earlier races are revoked first, keeping the
+-- newest grant per (user, purpose), and each revocation is recorded in
+-- audit_logs like one made through the API. gen_random_uuid() needs
+-- PostgreSQL 13+.
+
+WITH revoked AS (
+    UPDATE consents c
+    SET status = 'REVOKED', revoked_at = now()
+    WHERE c.status = 'GRANTED'
+      AND EXISTS (
+          SELECT 1 FROM consents newer
+          WHERE newer.user_id = c.user_id
+            AND newer.purpose_id = c.purpose_id
+            AND newer.status = 'GRANTED'
+            AND newer.id > c.id
+      )
+    RETURNING c.uuid, c.user_id, c.fiduciary_id
+)
+INSERT INTO audit_logs (uuid, user_id, fiduciary_id, action, resource_type, resource_id, details)
+SELECT gen_random_uuid(), user_id, fiduciary_id, 'CONSENT_REVOKED', 'consent', uuid::text,
+       jsonb_build_object('reason', 'Duplicate active consent superseded by a newer grant')
+FROM revoked;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_consents_user_purpose_active
+    ON consents (user_id, purpose_id) WHERE status = 'GRANTED';
@@ -0,0 +1,17 @@
+-- Migration: Indexes for consent listings and receipt lookups
+-- Date: 2026-10-16
+-- Description: "My consents" filters by user (optionally by status) and
+-- orders by granted_at DESC; receipt downloads and renewals fetch the
+-- newest receipt of a consent. consents.uuid is already covered by its
+-- unique index. A consent gets a new receipt on every renewal, so
+-- consent_receipts.consent_id cannot be unique.
+
+CREATE INDEX IF NOT EXISTS ix_consents_user_granted_at
+    ON consents (user_id, granted_at DESC);
+CREATE INDEX IF NOT EXISTS ix_consents_user_status
+    ON consents (user_id, status);
+CREATE INDEX IF NOT EXISTS ix_consent_receipts_consent_issued
+    ON consent_receipts (consent_id, issued_at DESC);
+
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS ix_consents_user_id;
@@ -0,0 +1,7 @@
+-- Migration: Opt-in batched webhook delivery
+-- Date: 2026-10-16
+-- Description: Webhooks with batch_events receive everything queued for
+-- them in one delivery run as a single {"events": [...]} POST. Existing
+-- webhooks keep the one-event-per-request format.
+
+ALTER TABLE webhooks ADD COLUMN IF NOT EXISTS batch_events BOOLEAN NOT NULL DEFAULT FALSE;
@@ -0,0 +1,8 @@
+"""
+Shared test setup: make the `app` package importable when pytest is run
+from the repository root as well as from server/.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
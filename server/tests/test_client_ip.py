@@ -0,0 +1,83 @@
+"""
+ClientIPMiddleware: which address ends up in request.state.client_ip
+"""
+import asyncio
+
+import pytest
+
+from app import main
+from app.main import ClientIPMiddleware
+
+
+def resolve(monkeypatch, headers, trust=True, proxies=1):
+    monkeypatch.setattr(main.settings, "TRUST_PROXY_HEADERS", trust)
+    monkeypatch.setattr(main.settings, "TRUSTED_PROXY_COUNT", proxies)
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen.update(scope["state"])
+
+    scope = {
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+        "client": ("10.0.0.1", 1234),
+    }
+    asyncio.run(ClientIPMiddleware(app)(scope, None, None))
+    return seen["client_ip"]
+
+
+def test_untrusted_headers_use_socket_peer(monkeypatch):
+    headers = [("X-Forwarded-For", "1.1.1.1")]
+    assert resolve(monkeypatch, headers, trust=False) == "10.0.0.1"
+
+
+def test_single_proxy_takes_rightmost_hop(monkeypatch):
+    headers = [("X-Forwarded-For", "6.6.6.6, 2.2.2.2")]
+    assert resolve(monkeypatch, headers) == "2.2.2.2"
+
+
+def test_repeated_headers_are_joined_in_order(monkeypatch):
+    headers = [
+        ("X-Forwarded-For", "6.6.6.6, 5.5.5.5"),
+        ("X-Forwarded-For", "3.3.3.3, 2.2.2.2"),
+    ]
+    assert resolve(monkeypatch, headers) == "2.2.2.2"
+    assert resolve(monkeypatch, headers, proxies=2) == "3.3.3.3"
+    assert resolve(monkeypatch, headers, proxies=3) == "5.5.5.5"
+
+
+def test_multiple_proxies_skip_their_own_hops(monkeypatch):
+    headers = [("X-Forwarded-For", "6.6.6.6, 1.1.1.1, 172.16.0.2")]
+    assert resolve(monkeypatch, headers, proxies=2) == "1.1.1.1"
+
+
+@pytest.mark.parametrize("value", ["1.1.1.1", ""])
+def test_short_header_falls_back_to_socket_peer(monkeypatch, value):
+    headers = [("X-Forwarded-For", value)]
+    assert resolve(monkeypatch, headers, proxies=2) == "10.0.0.1"
+
+
+def test_missing_header_falls_back_to_socket_peer(monkeypatch):
+    assert resolve(monkeypatch, []) == "10.0.0.1"
+
+
+def test_empty_hop_falls_back_to_socket_peer(monkeypatch):
+    headers = [("X-Forwarded-For", "1.1.1.1,")]
+    assert resolve(monkeypatch, headers) == "10.0.0.1"
+
+
+def test_proxy_count_below_one_is_treated_as_one(monkeypatch):
+    headers = [("X-Forwarded-For", "6.6.6.6, 2.2.2.2")]
+    assert resolve(monkeypatch, headers, proxies=0) == "2.2.2.2"
+
+
+def test_non_http_scopes_are_untouched(monkeypatch):
+    monkeypatch.setattr(main.settings, "TRUST_PROXY_HEADERS", True)
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(scope)
+
+    scope = {"type": "lifespan"}
+    asyncio.run(ClientIPMiddleware(app)(scope, None, None))
+    assert "state" not in seen[0]
@@ -0,0 +1,41 @@
+"""
+generate_uuid: RFC 9562 UUIDv7 layout
+"""
+import time
+import uuid
+
+from app.database import generate_uuid
+
+
+def test_canonical_string_form():
+    value = generate_uuid()
+    assert len(value) == 36
+    assert str(uuid.UUID(value)) == value
+
+
+def test_version_and_variant_bits():
+    for _ in range(1000):
+        value = uuid.UUID(generate_uuid())
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert value.int >> 76 & 0xF == 0x7
+        assert value.int >> 62 & 0b11 == 0b10
+
+
+def test_timestamp_is_unix_milliseconds():
+    before = time.time_ns() // 1_000_000
+    value = uuid.UUID(generate_uuid())
+    after = time.time_ns() // 1_000_000
+    assert before <= value.int >> 80 <= after
+
+
+def test_ordered_by_creation_time():
+    first = generate_uuid()
+    time.sleep(0.002)
+    second = generate_uuid()
+    assert first < second
+
+
+def test_random_bits_differ():
+    values = {generate_uuid() for _ in range(1000)}
+    assert len(values) == 1000
@@ -0,0 +1,86 @@
+"""
+Webhook worker helpers: retry scheduling and batch payloads
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.constants import WEBHOOK_MAX_RETRIES, WEBHOOK_RETRY_DELAYS
+from app.services.webhook import _next_retry_at, _post_batch, verify_signature
+
+
+class FakeClient:
+    """Records POSTs and answers each with a fixed status"""
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.requests = []
+
+    def post(self, url, content, headers):
+        self.requests.append(SimpleNamespace(url=url, content=content, headers=headers))
+        return SimpleNamespace(status_code=self.status_code, text="ok")
+
+
+def endpoint(batch_events):
+    return {7: SimpleNamespace(url="https://hooks.test/in", secret="whsec_test", batch_events=batch_events)}
+
+
+def delivery(n, event_type="consent.granted"):
+    return SimpleNamespace(
+        webhook_id=7,
+        uuid=f"00000000-0000-7000-8000-00000000000{n}",
+        event_type=event_type,
+        payload={"event": event_type, "data": {"n": n}},
+    )
+
+
+@pytest.mark.parametrize("attempt", range(1, WEBHOOK_MAX_RETRIES + 1))
+def test_next_retry_follows_the_delay_schedule(attempt):
+    before = datetime.now(timezone.utc)
+    retry_at = _next_retry_at(attempt)
+    after = datetime.now(timezone.utc)
+    delay = timedelta(seconds=WEBHOOK_RETRY_DELAYS[attempt - 1])
+    assert before + delay <= retry_at <= after + delay
+
+
+def test_next_retry_is_none_once_retries_are_exhausted():
+    assert _next_retry_at(WEBHOOK_MAX_RETRIES + 1) is None
+
+
+def test_single_delivery_is_sent_as_its_own_payload():
+    client = FakeClient()
+    c = delivery(1)
+
+    result = _post_batch(client, endpoint(batch_events=False), [c])
+
+    assert result == (200, "ok", None)
+    [request] = client.requests
+    assert json.loads(request.content) == c.payload
+    assert request.headers["X-Eigensparse-Event"] == "consent.granted"
+    assert request.headers["X-Eigensparse-Delivery-ID"] == c.uuid
+    assert verify_signature(request.content, request.headers["X-Eigensparse-Signature"], "whsec_test")
+
+
+@pytest.mark.parametrize("batch_events,count", [(True, 1), (True, 3), (False, 2)])
+def test_batches_are_sent_as_one_events_payload(batch_events, count):
+    client = FakeClient()
+    batch = [delivery(n) for n in range(count)]
+
+    _post_batch(client, endpoint(batch_events), batch)
+
+    [request] = client.requests
+    assert json.loads(request.content) == {
+        "events": [{"delivery_id": c.uuid, **c.payload} for c in batch]
+    }
+    assert request.headers["X-Eigensparse-Event"] == "batch"
+    assert request.headers["X-Eigensparse-Delivery-ID"] not in {c.uuid for c in batch}
+
+
+def test_failed_batch_reports_the_status():
+    client = FakeClient(status_code=503)
+
+    result = _post_batch(client, endpoint(batch_events=True), [delivery(1)])
+
+    assert result == (503, "ok", "HTTP 503")